@@ -6,33 +6,63 @@ Command-line interface for Filen CLI - UPDATED WITH BETTER AUTH
 
 import sys
 import argparse
+import functools
 import os
-from pathlib import Path
+import posixpath
+import re
+import time
 from typing import Optional
 
-from config.config import config_service
-from services.auth import auth_service
-from services.drive import drive_service, format_size, format_date
-from services.network_utils import network_utils
-from services.webdav_server import webdav_server
 
-class FilenCLI:
-    """Main CLI application"""
+__version__ = '1.0.0'
 
-    def __init__(self):
-        self.config = config_service
-        self.auth = auth_service
-        self.drive = drive_service
-        self.network = network_utils
-        self.debug = False
-        self.force = False
+# Services that external callers may still import from this module
+# (e.g. `cli.drive_service`). Resolved on first attribute access.
+_LAZY_SERVICES = {
+    'config_service': ('config.config', 'config_service'),
+    'auth_service': ('services.auth', 'auth_service'),
+    'drive_service': ('services.drive', 'drive_service'),
+    'network_utils': ('services.network_utils', 'network_utils'),
+    'webdav_server': ('services.webdav_server', 'webdav_server'),
+}
 
-    def run(self, args: list) -> int:
-        """Main entry point"""
-        parser = argparse.ArgumentParser(
-            description='Filen CLI - Command-line client for Filen.io',
-            formatter_class=argparse.RawDescriptionHelpFormatter,
-            epilog="""
+
+# Canonical 36-char UUID shape, compiled once (cheaper and stricter than
+# counting dashes)
+_UUID_RE = re.compile(
+    r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+    r'[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+
+
+def _is_uuid(value: str) -> bool:
+    """True if value looks like a canonical UUID"""
+    return _UUID_RE.match(value) is not None
+
+
+@functools.lru_cache(maxsize=16)
+def _format_last_login(iso_str: str) -> str:
+    """Render a stored ISO login timestamp for display (memoized)"""
+    from datetime import datetime
+    dt = datetime.fromisoformat(iso_str.replace('Z', '+00:00'))
+    return dt.strftime('%Y-%m-%d %H:%M:%S UTC')
+
+
+@functools.lru_cache(maxsize=64)
+def _glob_union_matcher(patterns: tuple):
+    """Compile glob patterns into one regex matcher.
+
+    Matching N patterns collapses into a single C-level regex pass;
+    os.path.normcase keeps fnmatch.fnmatch's case handling.
+    """
+    import fnmatch
+    union = '|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns)
+    return re.compile(union).match
+
+
+_YES = frozenset({'y', 'yes'})
+
+# Help epilog, attached only when the full parser is built
+_EPILOG = """
 Examples:
   filen login
   filen ls /Documents -d
@@ -41,7 +71,7 @@ Examples:
   filen tree / -l 2
   filen find / "*.pdf" --maxdepth 3
   filen search "report"
-  
+
 WebDAV Examples:
   filen webdav-start -b --port 8080
   filen webdav-status
@@ -49,42 +79,369 @@ WebDAV Examples:
   filen webdav-mount
   filen webdav-stop
             """
-        )
+
+# Fixed column widths for the item table printed by _print_item_list
+
+_TABLE_NAME_WIDTH = 40
+_TABLE_SIZE_WIDTH = 12
+_TABLE_DATE_WIDTH = 16
+
+
+def _build_table_borders(detailed: bool, uuid_width: int) -> tuple:
+    """Pre-render (top, header, separator, footer) for the item table"""
+    if detailed:
+        span = (9 + _TABLE_NAME_WIDTH + (_TABLE_SIZE_WIDTH + 2)
+                + (_TABLE_DATE_WIDTH + 2) + (uuid_width + 2))
+        header = (f"║  Type    {'Name'.ljust(_TABLE_NAME_WIDTH)}  "
+                  f"{'Size'.rjust(_TABLE_SIZE_WIDTH)}  "
+                  f"{'Modified'.rjust(_TABLE_DATE_WIDTH)}  "
+                  f"{'UUID'.ljust(uuid_width)} ║")
+    else:
+        span = (9 + _TABLE_NAME_WIDTH + (_TABLE_SIZE_WIDTH + 2)
+                + (uuid_width + 2))
+        header = (f"║  Type    {'Name'.ljust(_TABLE_NAME_WIDTH)}  "
+                  f"{'Size'.rjust(_TABLE_SIZE_WIDTH)}  "
+                  f"{'UUID'.ljust(uuid_width)} ║")
+    line = '═' * span
+    return (f"╔{line}╗", header, f"╠{line}╣", f"╚{line}╝")
+
+
+# All four layout variants, keyed by (detailed, show_uuids)
+_TABLE_BORDERS = {
+    (detailed, show_uuids): _build_table_borders(detailed, 36 if show_uuids else 11)
+    for detailed in (False, True)
+    for show_uuids in (False, True)
+}
+
+
+def _requires_client(validate_session: bool = False):
+    """Decorator: load credentials into the client before the handler runs.
+
+    Replaces the `self._prepare_client()` boilerplate that every file
+    operation handler used to open with.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, *args, **kwargs):
+            self._prepare_client(validate_session=validate_session)
+            return handler(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _handles_errors(label: str):
+    """Decorator: shared failure handling for command handlers.
+
+    Prints '<label> failed', dumps the traceback under --verbose and
+    returns 1 - the boilerplate every handler's except block repeated.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return handler(self, *args, **kwargs)
+            except Exception as e:
+                print(f"❌ {label} failed: {e}")
+                if self.debug:
+                    import traceback
+                    traceback.print_exc()
+                return 1
+        return wrapper
+    return decorator
+
+
+def __getattr__(name):
+    """Lazily resolve service singletons for external importers"""
+    if name in _LAZY_SERVICES:
+        import importlib
+        module_name, attr = _LAZY_SERVICES[name]
+        value = getattr(importlib.import_module(module_name), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class FilenCLI:
+    """Main CLI application"""
+
+    def __init__(self):
+        # Services are bound lazily so `filen --help` and argparse errors
+        # don't pay for the crypto/HTTP stacks behind them
+        self._config = None
+        self._auth = None
+        self._drive = None
+        self._network = None
+        self._client_credentials = None
+        self._session_validated_at = 0.0
+        self._parser_cache = {}
+        self._trash_index = None
+        self.debug = False
+        self.force = False
+
+    @property
+    def config(self):
+        if self._config is None:
+            from config.config import config_service
+            self._config = config_service
+        return self._config
+
+    @property
+    def auth(self):
+        if self._auth is None:
+            from services.auth import auth_service
+            self._auth = auth_service
+        return self._auth
+
+    @property
+    def drive(self):
+        if self._drive is None:
+            from services.drive import drive_service
+            self._drive = drive_service
+        return self._drive
+
+    @property
+    def network(self):
+        if self._network is None:
+            from services.network_utils import network_utils
+            self._network = network_utils
+        return self._network
+
+    def run(self, args: list) -> int:
+        """Main entry point"""
+        # --version needs no parser (or services) at all
+        if args and args[0] in ('--version', '-V'):
+            print(f"filen-cli {__version__}")
+            return 0
+
+        # Only build the subparser for the command actually being invoked;
+        # constructing all ~25 of them dominates argparse startup time
+        parser = self._get_parser(self._sniff_subcommand(args))
+        parsed = parser.parse_args(args)
+        
+        if not parsed.command:
+            parser.print_help()
+            return 0
         
+        # Set debug/force mode (FILEN_FORCE=1 covers CI pipelines that
+        # can't pass -f per invocation)
+        self.debug = parsed.verbose
+        self.force = parsed.force or os.environ.get('FILEN_FORCE') == '1'
+        self.drive.debug = self.debug
+        self.auth.api.debug = self.debug
+        
+        # Handle commands
+        try:
+            if parsed.command == 'help':
+                parser.print_help()
+                return 0
+
+            handler = getattr(parsed, 'func', None)
+            if handler is None:
+                print(f"Unknown command: {parsed.command}")
+                return 1
+
+            return handler(parsed)
+
+        except KeyboardInterrupt:
+            print("\n❌ Cancelled by user")
+            return 1
+        except ValueError as e:
+            # Handle auth errors specially
+            if 'MissingCredentialsError' in str(e):
+                print(f"❌ {e}")
+                print("💡 Run 'filen login' to authenticate")
+                return 1
+            print(f"❌ Error: {e}")
+            if self.debug:
+                import traceback
+                traceback.print_exc()
+            return 1
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            if self.debug:
+                import traceback
+                traceback.print_exc()
+            return 1
+
+    def _command_handlers(self) -> dict:
+        """Command name -> handler, for O(1) dispatch"""
+        return {
+            # Authentication
+            'login': lambda _parsed: self.handle_login(),
+            'logout': lambda _parsed: self.handle_logout(),
+            'whoami': lambda _parsed: self.handle_whoami(),
+            # File operations
+            'ls': self.handle_list,
+            'mkdir': self.handle_mkdir,
+            'upload': self.handle_upload,
+            'download': self.handle_download,
+            'download-path': self.handle_download_path,
+            'mv': self.handle_move,
+            'cp': self.handle_copy,
+            'rename': self.handle_rename,
+            'trash': self.handle_trash,
+            'delete-path': self.handle_delete,
+            'verify': self.handle_verify,
+            # Trash operations
+            'list-trash': self.handle_list_trash,
+            'restore-uuid': self.handle_restore_uuid,
+            'restore-path': self.handle_restore_path,
+            # Search/find
+            'resolve': self.handle_resolve,
+            'search': self.handle_search,
+            'find': self.handle_find,
+            'tree': self.handle_tree,
+            # WebDAV
+            'mount': self.handle_mount,
+            'webdav-start': self.handle_webdav_start,
+            'webdav-stop': self.handle_webdav_stop,
+            'webdav-status': self.handle_webdav_status,
+            'webdav-test': self.handle_webdav_test,
+            'webdav-mount': self.handle_webdav_mount,
+            'webdav-config': self.handle_webdav_config,
+            # Other
+            'batch': self.handle_batch,
+            'config': lambda _parsed: self.handle_config(),
+        }
+
+    # ============================================================================
+    # PARSER CONSTRUCTION (LAZY)
+    # ============================================================================
+
+    @staticmethod
+    def _sniff_subcommand(args: list) -> Optional[str]:
+        """Find the subcommand token without running argparse.
+
+        The global flags (-v/-f) are store_true, so the first token that
+        doesn't start with '-' is the subcommand.
+        """
+        for token in args:
+            if not token.startswith('-'):
+                return token
+        return None
+
+    def _get_parser(self, command: Optional[str] = None) -> argparse.ArgumentParser:
+        """Cached wrapper around _build_parser.
+
+        Repeated run() calls in the same process (REPL or daemon style
+        usage) reuse the parser built for each command.
+        """
+        parser = self._parser_cache.get(command)
+        if parser is None:
+            parser = self._build_parser(command)
+            self._parser_cache[command] = parser
+        return parser
+
+    def _build_parser(self, command: Optional[str] = None) -> argparse.ArgumentParser:
+        """Build the argument parser.
+
+        If `command` names a known subcommand, only that subparser is
+        constructed. Otherwise (no command, 'help', or an unknown token)
+        all subparsers are built so argparse can print full help/errors.
+        """
+        builders = self._subparser_builders()
+        single_command = command in builders and command != 'help'
+
+        parser = argparse.ArgumentParser(
+            description='Filen CLI - Command-line client for Filen.io',
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            # The examples block is only rendered by full help, which
+            # never happens on the single-subparser fast path
+            epilog=None if single_command else _EPILOG
+        )
+
         # Global flags
+        parser.add_argument('-V', '--version', action='version',
+                          version=f'filen-cli {__version__}')
         parser.add_argument('-v', '--verbose', action='store_true',
                           help='Enable verbose debug output')
         parser.add_argument('-f', '--force', action='store_true',
                           help='Force overwrite / ignore conflicts')
-        
+
         # Subcommands
         subparsers = parser.add_subparsers(dest='command', help='Commands')
-        
-        # ========================================================================
-        # Authentication Commands
-        # ========================================================================
-        
-        subparsers.add_parser('login', help='Login to account')
-        subparsers.add_parser('logout', help='Logout and clear credentials')
-        subparsers.add_parser('whoami', help='Show current user')
-        
-        # ========================================================================
-        # File Operations
-        # ========================================================================
-        
-        # List (ls)
+
+        if single_command:
+            builders[command](subparsers)
+        else:
+            for build in builders.values():
+                build(subparsers)
+
+        # Bind each subparser to its handler so parse_args yields the
+        # callable directly (no name lookup at dispatch time)
+        handlers = self._command_handlers()
+        for name, subparser in subparsers.choices.items():
+            handler = handlers.get(name)
+            if handler is not None:
+                subparser.set_defaults(func=handler)
+
+        return parser
+
+    def _subparser_builders(self) -> dict:
+        """Command name -> builder that adds just that subparser.
+
+        Keyed in help-display order so building all of them reproduces
+        the full help output.
+        """
+        return {
+            # Authentication commands
+            'login': lambda sub: sub.add_parser('login', help='Login to account'),
+            'logout': lambda sub: sub.add_parser('logout', help='Logout and clear credentials'),
+            'whoami': lambda sub: sub.add_parser('whoami', help='Show current user'),
+            # File operations
+            'ls': self._build_ls_parser,
+            'mkdir': self._build_mkdir_parser,
+            'upload': self._build_upload_parser,
+            'download': self._build_download_parser,
+            'download-path': self._build_download_path_parser,
+            'mv': self._build_move_parser,
+            'cp': self._build_copy_parser,
+            'rename': self._build_rename_parser,
+            'trash': self._build_trash_parser,
+            'delete-path': self._build_delete_parser,
+            'verify': self._build_verify_parser,
+            'list-trash': self._build_list_trash_parser,
+            'restore-uuid': self._build_restore_uuid_parser,
+            'restore-path': self._build_restore_path_parser,
+            'resolve': self._build_resolve_parser,
+            'search': self._build_search_parser,
+            'find': self._build_find_parser,
+            'tree': self._build_tree_parser,
+            # WebDAV commands
+            'mount': self._build_mount_parser,
+            'webdav-start': self._build_webdav_start_parser,
+            'webdav-stop': lambda sub: sub.add_parser('webdav-stop', help='Stop background server'),
+            'webdav-status': self._build_webdav_status_parser,
+            'webdav-test': self._build_webdav_test_parser,
+            'webdav-mount': self._build_webdav_mount_parser,
+            'webdav-config': self._build_webdav_config_parser,
+            # Other commands
+            'batch': self._build_batch_parser,
+            'config': lambda sub: sub.add_parser('config', help='Show configuration'),
+            'help': lambda sub: sub.add_parser('help', help='Show help'),
+        }
+
+    @staticmethod
+    def _build_batch_parser(subparsers):
+        batch_parser = subparsers.add_parser('batch', help='Run commands from a file in one session')
+        batch_parser.add_argument('file', help="Command file, one per line ('-' for stdin)")
+
+    @staticmethod
+    def _build_ls_parser(subparsers):
         ls_parser = subparsers.add_parser('ls', help='List folder contents')
         ls_parser.add_argument('path', nargs='?', default='/', help='Folder path or pattern')
         ls_parser.add_argument('-d', '--detailed', action='store_true', help='Show detailed information')
         ls_parser.add_argument('--uuids', action='store_true', help='Show full UUIDs')
         ls_parser.add_argument('--include', action='append', help='Include file pattern')
         ls_parser.add_argument('--exclude', action='append', help='Exclude file pattern')
-        
-        # Make directory
+
+    @staticmethod
+    def _build_mkdir_parser(subparsers):
         mkdir_parser = subparsers.add_parser('mkdir', help='Create folder(s)')
         mkdir_parser.add_argument('path', help='Folder path to create')
-        
-        # Upload
+
+    @staticmethod
+    def _build_upload_parser(subparsers):
         upload_parser = subparsers.add_parser('upload', help='Upload files')
         upload_parser.add_argument('sources', nargs='+', help='Source files/folders')
         upload_parser.add_argument('-t', '--target', default='/',
@@ -99,14 +456,17 @@ WebDAV Examples:
                                  help='Include file pattern')
         upload_parser.add_argument('--exclude', action='append',
                                  help='Exclude file pattern')
-        
-        # Download
+
+    @staticmethod
+    def _build_download_parser(subparsers):
         download_parser = subparsers.add_parser('download', help='Download file')
         download_parser.add_argument('path', help='File path or UUID')
         download_parser.add_argument('-o', '--output', help='Output file path')
         download_parser.add_argument('--on-conflict', choices=['skip', 'overwrite', 'newer'],
                                    default='skip', help='Action if target exists')
-        
+
+    @staticmethod
+    def _build_download_path_parser(subparsers):
         # Download Path - Now accepts "download-path /remote/path /local/dest"
         download_path_parser = subparsers.add_parser('download-path', help='Download by path')
         download_path_parser.add_argument('paths', nargs='+', help='Remote path(s) [and local destination]')
@@ -116,310 +476,207 @@ WebDAV Examples:
         download_path_parser.add_argument('--on-conflict', choices=['skip', 'overwrite', 'newer'], default='skip', help='Conflict action')
         download_path_parser.add_argument('--include', action='append', help='Include pattern')
         download_path_parser.add_argument('--exclude', action='append', help='Exclude pattern')
-        
+
+    @staticmethod
+    def _build_move_parser(subparsers):
         # Move (mv) - Now accepts "mv src1 src2 dest"
         move_parser = subparsers.add_parser('mv', help='Move file/folder')
         move_parser.add_argument('paths', nargs='+', help='Source path(s) and Destination')
         move_parser.add_argument('--include', action='append', help='Include file pattern')
         move_parser.add_argument('--exclude', action='append', help='Exclude file pattern')
 
+    @staticmethod
+    def _build_copy_parser(subparsers):
         # Copy (cp) - Now accepts "cp src1 src2 dest"
         copy_parser = subparsers.add_parser('cp', help='Copy file')
         copy_parser.add_argument('paths', nargs='+', help='Source path(s) and Destination')
         copy_parser.add_argument('--include', action='append', help='Include file pattern')
         copy_parser.add_argument('--exclude', action='append', help='Exclude file pattern')
-        
-        # Rename
+
+    @staticmethod
+    def _build_rename_parser(subparsers):
         rename_parser = subparsers.add_parser('rename', help='Rename item')
         rename_parser.add_argument('path', help='Item path')
         rename_parser.add_argument('new_name', help='New name')
-        
-        # Trash
+
+    @staticmethod
+    def _build_trash_parser(subparsers):
         trash_parser = subparsers.add_parser('trash', help='Move to trash')
-        trash_parser.add_argument('path', help='Item path')
+        trash_parser.add_argument('paths', nargs='+', help='Item path(s)')
         trash_parser.add_argument('--include', action='append', help='Include pattern')
         trash_parser.add_argument('--exclude', action='append', help='Exclude pattern')
         trash_parser.add_argument('-r', '--recursive', action='store_true', help='Allow deleting folders via wildcard')
-        
-        # Delete
+
+    @staticmethod
+    def _build_delete_parser(subparsers):
         delete_parser = subparsers.add_parser('delete-path', help='Permanently delete')
-        delete_parser.add_argument('path', help='Item path')
+        delete_parser.add_argument('paths', nargs='+', help='Item path(s)')
         delete_parser.add_argument('--include', action='append', help='Include pattern')
         delete_parser.add_argument('--exclude', action='append', help='Exclude pattern')
-        
-        # Verify
+
+    @staticmethod
+    def _build_verify_parser(subparsers):
         verify_parser = subparsers.add_parser('verify', help='Verify upload (SHA-512)')
         verify_parser.add_argument('remote', help='File UUID or path')
         verify_parser.add_argument('local', help='Local file path')
-        
-        # List Trash
+
+    @staticmethod
+    def _build_list_trash_parser(subparsers):
         list_trash_parser = subparsers.add_parser('list-trash', help='Show trash contents')
         list_trash_parser.add_argument('--uuids', action='store_true', help='Show full UUIDs')
         list_trash_parser.add_argument('--include', action='append', help='Include file pattern')
         list_trash_parser.add_argument('--exclude', action='append', help='Exclude file pattern')
-        
-        # Restore by UUID
-        restore_uuid_parser = subparsers.add_parser('restore-uuid', 
+
+    @staticmethod
+    def _build_restore_uuid_parser(subparsers):
+        restore_uuid_parser = subparsers.add_parser('restore-uuid',
                                                    help='Restore from trash by UUID')
         restore_uuid_parser.add_argument('uuid', help='Item UUID')
-        
-        # Restore by path
+
+    @staticmethod
+    def _build_restore_path_parser(subparsers):
         restore_path_parser = subparsers.add_parser('restore-path',
                                                    help='Restore from trash by name')
         restore_path_parser.add_argument('name', help='Item name')
-        
-        # Resolve
+
+    @staticmethod
+    def _build_resolve_parser(subparsers):
         resolve_parser = subparsers.add_parser('resolve', help='Debug path resolution')
         resolve_parser.add_argument('path', help='Path to resolve')
-        
-        # Search
+
+    @staticmethod
+    def _build_search_parser(subparsers):
         search_parser = subparsers.add_parser('search', help='Server-side search')
         search_parser.add_argument('query', help='Search query')
         search_parser.add_argument('--uuids', action='store_true', help='Show full UUIDs')
         search_parser.add_argument('--include', action='append', help='Include file pattern')
         search_parser.add_argument('--exclude', action='append', help='Exclude file pattern')
-        
-        # Find (Update to include filters)
+
+    @staticmethod
+    def _build_find_parser(subparsers):
         find_parser = subparsers.add_parser('find', help='Recursive file find')
         find_parser.add_argument('path', help='Starting path')
         find_parser.add_argument('pattern', help='File pattern (e.g., "*.pdf")')
         find_parser.add_argument('--maxdepth', type=int, default=-1, help='Limit depth (-1 for infinite)')
         find_parser.add_argument('--include', action='append', help='Additional include pattern')
         find_parser.add_argument('--exclude', action='append', help='Exclude file pattern')
-        
-        # Tree
+
+    @staticmethod
+    def _build_tree_parser(subparsers):
         tree_parser = subparsers.add_parser('tree', help='Show folder tree')
         tree_parser.add_argument('path', nargs='?', default='/', help='Starting path')
         tree_parser.add_argument('-l', '--depth', type=int, default=3,
                                help='Maximum depth (default: 3)')
-        
-        # ========================================================================
-        # WebDAV Commands
-        # ========================================================================
-        
-        # Mount (foreground)
+
+    @staticmethod
+    def _add_port_argument(parser):
+        """Shared --port option for the WebDAV subparsers.
+
+        SUPPRESS keeps the Namespace free of a default so handlers can
+        tell "user chose 8080" apart from "no --port given" and fall
+        back to the saved WebDAV config.
+        """
+        parser.add_argument('--port', type=int, default=argparse.SUPPRESS,
+                            help='WebDAV port (default: 8080)')
+
+    @classmethod
+    def _build_mount_parser(cls, subparsers):
         mount_parser = subparsers.add_parser('mount', help='Start WebDAV (foreground)')
-        mount_parser.add_argument('--port', type=int, default=8080,
-                                help='WebDAV port (default: 8080)')
+        cls._add_port_argument(mount_parser)
         mount_parser.add_argument('-m', '--mount-point', help='Mount point path')
         mount_parser.add_argument('--webdav-debug', action='store_true',
                                 help='Enable WebDAV debug logging')
-        
-        # WebDAV start
-        webdav_start_parser = subparsers.add_parser('webdav-start', 
+
+    @classmethod
+    def _build_webdav_start_parser(cls, subparsers):
+        webdav_start_parser = subparsers.add_parser('webdav-start',
                                                     help='Start WebDAV server')
         webdav_start_parser.add_argument('-b', '--background', action='store_true',
                                         help='Run in background')
-        webdav_start_parser.add_argument('--port', type=int, default=8080,
-                                        help='WebDAV port (default: 8080)')
+        cls._add_port_argument(webdav_start_parser)
         webdav_start_parser.add_argument('--daemon', action='store_true',
                                         help=argparse.SUPPRESS)  # Hidden: internal flag
-        
-        # WebDAV stop
-        subparsers.add_parser('webdav-stop', help='Stop background server')
-        
-        # WebDAV status
-        webdav_status_parser = subparsers.add_parser('webdav-status', 
+
+    @classmethod
+    def _build_webdav_status_parser(cls, subparsers):
+        webdav_status_parser = subparsers.add_parser('webdav-status',
                                                      help='Check server status')
-        webdav_status_parser.add_argument('--port', type=int, default=8080,
-                                        help='WebDAV port (default: 8080)')
-        
-        # WebDAV test
+        cls._add_port_argument(webdav_status_parser)
+
+    @classmethod
+    def _build_webdav_test_parser(cls, subparsers):
         webdav_test_parser = subparsers.add_parser('webdav-test',
                                                    help='Test server connection')
-        webdav_test_parser.add_argument('--port', type=int, default=8080,
-                                       help='WebDAV port (default: 8080)')
-        
-        # WebDAV mount instructions
+        cls._add_port_argument(webdav_test_parser)
+
+    @classmethod
+    def _build_webdav_mount_parser(cls, subparsers):
         webdav_mount_parser = subparsers.add_parser('webdav-mount',
                                                     help='Show mount instructions')
-        webdav_mount_parser.add_argument('--port', type=int, default=8080,
-                                        help='WebDAV port (default: 8080)')
-        
-        # WebDAV config
+        cls._add_port_argument(webdav_mount_parser)
+
+    @classmethod
+    def _build_webdav_config_parser(cls, subparsers):
         webdav_config_parser = subparsers.add_parser('webdav-config',
                                                      help='Show server config')
-        webdav_config_parser.add_argument('--port', type=int, default=8080,
-                                         help='WebDAV port (default: 8080)')
-        
-        # ========================================================================
-        # Other Commands
-        # ========================================================================
-        
-        subparsers.add_parser('config', help='Show configuration')
-        subparsers.add_parser('help', help='Show help')
-        
-        # Parse arguments
-        parsed = parser.parse_args(args)
-        
-        if not parsed.command:
-            parser.print_help()
-            return 0
-        
-        # Set debug/force mode
-        self.debug = parsed.verbose
-        self.force = parsed.force
-        self.drive.debug = self.debug
-        self.auth.api.debug = self.debug
-        
-        # Handle commands
-        try:
-            # Authentication
-            if parsed.command == 'login':
-                return self.handle_login()
-            elif parsed.command == 'logout':
-                return self.handle_logout()
-            elif parsed.command == 'whoami':
-                return self.handle_whoami()
-            
-            # File operations
-            elif parsed.command == 'ls':
-                return self.handle_list(parsed)
-            elif parsed.command == 'mkdir':
-                return self.handle_mkdir(parsed)
-            elif parsed.command == 'upload':
-                return self.handle_upload(parsed)
-            elif parsed.command == 'download':
-                return self.handle_download(parsed)
-            elif parsed.command == 'download-path':
-                return self.handle_download_path(parsed)
-            elif parsed.command == 'mv':
-                return self.handle_move(parsed)
-            elif parsed.command == 'cp':
-                return self.handle_copy(parsed)
-            elif parsed.command == 'rename':
-                return self.handle_rename(parsed)
-            elif parsed.command == 'trash':
-                return self.handle_trash(parsed)
-            elif parsed.command == 'delete-path':
-                return self.handle_delete(parsed)
-            elif parsed.command == 'verify':
-                return self.handle_verify(parsed)
-            
-            # Trash operations
-            elif parsed.command == 'list-trash':
-                return self.handle_list_trash(parsed)
-            elif parsed.command == 'restore-uuid':
-                return self.handle_restore_uuid(parsed)
-            elif parsed.command == 'restore-path':
-                return self.handle_restore_path(parsed)
-            
-            # Search/find
-            elif parsed.command == 'resolve':
-                return self.handle_resolve(parsed)
-            elif parsed.command == 'search':
-                return self.handle_search(parsed)
-            elif parsed.command == 'find':
-                return self.handle_find(parsed)
-            elif parsed.command == 'tree':
-                return self.handle_tree(parsed)
-            
-            # WebDAV
-            elif parsed.command == 'mount':
-                return self.handle_mount(parsed)
-            elif parsed.command == 'webdav-start':
-                return self.handle_webdav_start(parsed)
-            elif parsed.command == 'webdav-stop':
-                return self.handle_webdav_stop(parsed)
-            elif parsed.command == 'webdav-status':
-                return self.handle_webdav_status(parsed)
-            elif parsed.command == 'webdav-test':
-                return self.handle_webdav_test(parsed)
-            elif parsed.command == 'webdav-mount':
-                return self.handle_webdav_mount(parsed)
-            elif parsed.command == 'webdav-config':
-                return self.handle_webdav_config(parsed)
-            
-            # Other
-            elif parsed.command == 'config':
-                return self.handle_config()
-            elif parsed.command == 'help':
-                parser.print_help()
-                return 0
-            
-            else:
-                print(f"Unknown command: {parsed.command}")
-                return 1
-        
-        except KeyboardInterrupt:
-            print("\n❌ Cancelled by user")
-            return 1
-        except ValueError as e:
-            # Handle auth errors specially
-            if 'MissingCredentialsError' in str(e):
-                print(f"❌ {e}")
-                print("💡 Run 'filen login' to authenticate")
-                return 1
-            print(f"❌ Error: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+        cls._add_port_argument(webdav_config_parser)
 
     # ============================================================================
     # AUTHENTICATION HANDLERS
     # ============================================================================
 
+    @staticmethod
+    def _prompt(prompt: str, secret: bool = False) -> Optional[str]:
+        """Read one stripped line from the user, None if empty"""
+        if secret:
+            import getpass
+            raw = getpass.getpass(prompt)
+        else:
+            raw = input(prompt)
+        return raw.strip() or None
+
     def handle_login(self) -> int:
         """Handle login command - IMPROVED"""
         try:
-            email = input('Email: ').strip()
+            email = self._prompt('Email: ')
             if not email:
                 print("❌ Email is required")
                 return 1
-            
+
             # Check if 2FA might be needed (informational only)
             self.auth.is_2fa_needed(email)
-            
-            import getpass
-            password = getpass.getpass('Password: ')
+
+            password = self._prompt('Password: ', secret=True)
             if not password:
                 print("❌ Password is required")
                 return 1
-            
+
             print("\n🔐 Logging in...")
-            
-            try:
-                credentials = self.auth.login(email, password)
-                return 0
-            
-            except ValueError as e:
-                error_str = str(e)
-                
-                # Handle 2FA requirement
-                if '2FA_REQUIRED' in error_str or 'enter_2fa' in error_str.lower() or 'wrong_2fa' in error_str.lower():
+
+            # First attempt without 2FA; one retry with a code if the
+            # server asks for it
+            tfa_code = None
+            while True:
+                try:
+                    self.auth.login(email, password, tfa_code)
+                    self._client_credentials = None  # force re-apply on next handler
+                    return 0
+
+                except ValueError as e:
+                    error_str = str(e).lower()
+                    needs_2fa = ('2fa_required' in error_str
+                                 or 'enter_2fa' in error_str
+                                 or 'wrong_2fa' in error_str)
+                    if not needs_2fa or tfa_code is not None:
+                        raise
+
                     print("\n🔐 Two-factor authentication required.")
-                    tfa_code = input('Enter 2FA code: ').strip()
-                    
+                    tfa_code = self._prompt('Enter 2FA code: ')
                     if not tfa_code:
                         print("❌ 2FA code required")
                         return 1
-                    
-                    try:
-                        print("\n🔐 Logging in with 2FA...")
-                        credentials = self.auth.login(email, password, tfa_code)
-                        return 0
-                    
-                    except Exception as e2:
-                        print(f"❌ Login failed: {e2}")
-                        if self.debug:
-                            import traceback
-                            traceback.print_exc()
-                        return 1
-                else:
-                    # Other error
-                    print(f"❌ Login failed: {e}")
-                    if self.debug:
-                        import traceback
-                        traceback.print_exc()
-                    return 1
-        
+                    print("\n🔐 Logging in with 2FA...")
+
         except Exception as e:
             print(f"❌ Login failed: {e}")
             if self.debug:
@@ -430,6 +687,8 @@ WebDAV Examples:
     def handle_logout(self) -> int:
         """Handle logout command"""
         self.auth.logout()
+        self._client_credentials = None
+        self._session_validated_at = 0.0
         print("✅ Logged out successfully")
         return 0
 
@@ -443,27 +702,28 @@ WebDAV Examples:
                 print("💡 Run 'filen login' to authenticate")
                 return 1
             
-            print("╔════════════════════════════════════════╗")
-            print("║         User Information               ║")
-            print("╚════════════════════════════════════════╝")
-            print(f"📧 Email: {info['email']}")
-            print(f"🆔 User ID: {info['userId']}")
-            print(f"📁 Root Folder: {info['rootFolderId']}")
-            
+            lines = [
+                "╔════════════════════════════════════════╗",
+                "║         User Information               ║",
+                "╚════════════════════════════════════════╝",
+                f"📧 Email: {info['email']}",
+                f"🆔 User ID: {info['userId']}",
+                f"📁 Root Folder: {info['rootFolderId']}",
+            ]
+
             # Show master keys count and last login
             try:
-                creds = self.auth.get_credentials()
-                keys = creds.get('masterKeys', '').split('|')
-                print(f"🔑 Master Keys: {len([k for k in keys if k])}")
-                
+                creds = self._get_cached_credentials()
+                key_count = sum(1 for k in creds.get('masterKeys', '').split('|') if k)
+                lines.append(f"🔑 Master Keys: {key_count}")
+
                 last_login = creds.get('lastLoggedInAt', '')
                 if last_login:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(last_login.replace('Z', '+00:00'))
-                    print(f"🕐 Last Login: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-            except:
+                    lines.append(f"🕐 Last Login: {_format_last_login(last_login)}")
+            except (ValueError, KeyError, AttributeError):
                 pass
-            
+
+            sys.stdout.write('\n'.join(lines) + '\n')
             return 0
         
         except Exception as e:
@@ -482,38 +742,92 @@ WebDAV Examples:
         Prepare client with credentials and optionally validate session
         """
         try:
-            creds = self.auth.get_credentials()
-            self.drive.set_credentials(creds)
-            
-            # Optionally validate session for long-running operations
+            # Load credentials and push them into the drive service once
+            # per process; handlers may call this repeatedly
+            if self._client_credentials is None:
+                creds = self.auth.get_credentials()
+                self.drive.set_credentials(creds)
+                self._client_credentials = creds
+
+            # Optionally validate session for long-running operations.
+            # A recent successful check is trusted for a few minutes so
+            # batch runs don't pay one extra round-trip per command.
             if validate_session:
-                if not self.auth.validate_session():
-                    print("⚠️  Session validation failed. Please login again.")
-                    raise ValueError("Session is no longer valid")
+                now = time.monotonic()
+                if now - self._session_validated_at >= 300:
+                    if not self.auth.validate_session():
+                        self._session_validated_at = 0.0
+                        print("⚠️  Session validation failed. Please login again.")
+                        raise ValueError("Session is no longer valid")
+                    self._session_validated_at = now
         
         except ValueError as e:
             if 'MissingCredentialsError' in str(e):
                 raise ValueError("Not logged in. Run 'filen login' first.")
             raise
 
+    def _get_cached_credentials(self) -> dict:
+        """Credentials as loaded by _prepare_client, loading them if needed"""
+        if self._client_credentials is None:
+            self._prepare_client()
+        return self._client_credentials
+
+    def _get_port(self, args) -> int:
+        """Effective WebDAV port: --port, else saved config, else 8080"""
+        port = getattr(args, 'port', None)
+        if port is not None:
+            return port
+        return self.config.read_webdav_config().get('port', 8080)
+
+    def _confirm_yes(self, prompt: str) -> bool:
+        """Ask a y/N question; always true when --force is set.
+
+        Without a TTY (pipelines, CI) the answer is "no" instead of
+        blocking on stdin until EOF.
+        """
+        if self.force:
+            return True
+        if not sys.stdin.isatty():
+            print("❌ Non-interactive session, refusing without -f (or FILEN_FORCE=1)")
+            return False
+        return input(prompt).strip().lower() in _YES
+
+    def _get_trash_index(self) -> tuple:
+        """One shared trash scan for the list/restore handlers.
+
+        Returns (items, by_uuid, by_name); by_name maps a name to the
+        list of trash items carrying it.
+        """
+        if self._trash_index is None:
+            items = self.drive.get_trash_content()
+            by_uuid = {i['uuid']: i for i in items}
+            by_name = {}
+            for item in items:
+                by_name.setdefault(item['name'], []).append(item)
+            self._trash_index = (items, by_uuid, by_name)
+        return self._trash_index
+
     # ============================================================================
     # WILDCARD & FILTER HELPERS
     # ============================================================================
 
     def _should_process_item(self, name: str, include: list, exclude: list) -> bool:
         """Filter items based on include/exclude patterns"""
-        import fnmatch
-        
+        if not include and not exclude:
+            return True
+
+        name = os.path.normcase(name)
+
         # If include patterns exist, file MUST match at least one
         if include:
-            if not any(fnmatch.fnmatch(name, pattern) for pattern in include):
+            if _glob_union_matcher(tuple(include))(name) is None:
                 return False
-                
+
         # If exclude patterns exist, file MUST NOT match any
         if exclude:
-            if any(fnmatch.fnmatch(name, pattern) for pattern in exclude):
+            if _glob_union_matcher(tuple(exclude))(name) is not None:
                 return False
-                
+
         return True
 
     def _expand_remote_path(self, path_pattern: str) -> list:
@@ -531,15 +845,15 @@ WebDAV Examples:
                     'uuid': resolved['uuid'],
                     'type': resolved['type'],
                     'path': resolved['path'],
-                    'name': resolved['metadata']['name']
+                    'name': resolved['metadata']['name'],
+                    'parent': resolved.get('parent')
                 }]
             except FileNotFoundError:
                 return []
 
         # Split into parent dir and pattern
         path_pattern = path_pattern.replace('\\', '/')
-        parent_path = os.path.dirname(path_pattern)
-        pattern = os.path.basename(path_pattern)
+        parent_path, pattern = posixpath.split(path_pattern)
         
         if not parent_path:
             parent_path = '/'
@@ -560,12 +874,13 @@ WebDAV Examples:
             matches = []
             for item in all_items:
                 if fnmatch.fnmatch(item['name'], pattern):
-                    full_path = os.path.join(parent_path, item['name']).replace('\\', '/')
+                    full_path = posixpath.join(parent_path, item['name'])
                     matches.append({
                         'uuid': item['uuid'],
                         'type': item['type'],
                         'path': full_path,
-                        'name': item['name']
+                        'name': item['name'],
+                        'parent': parent_uuid
                     })
             
             return matches
@@ -579,334 +894,313 @@ WebDAV Examples:
     # FILE OPERATION HANDLERS (Updated to use _prepare_client)
     # ============================================================================
 
+    @_requires_client()
+    @_handles_errors('List')
     def handle_list(self, args) -> int:
         """Handle list command with wildcards and filtering"""
-        try:
-            self._prepare_client()
-            
-            # 1. Expand path/pattern
-            # If args.path looks like a glob (contains *?[), expand it
-            # Otherwise treat as a folder list unless it's a file
-            import fnmatch
-            path_arg = args.path
-            
-            is_pattern = any(char in path_arg for char in ['*', '?', '['])
-            
-            # Get filters
-            include = getattr(args, 'include', []) or []
-            exclude = getattr(args, 'exclude', []) or []
-            
-            if is_pattern:
-                # Case A: "ls *.txt" -> List matches
-                items = self._expand_remote_path(path_arg)
-                # Apply filters
-                filtered = [i for i in items if self._should_process_item(i['name'], include, exclude)]
-                
-                if not filtered:
-                    print(f"📭 No items found matching '{path_arg}'")
-                    return 0
-                    
-                print(f"🔍 Found {len(filtered)} items matching '{path_arg}':\n")
-                self._print_item_list(filtered, args.detailed, args.uuids)
+        # 1. Expand path/pattern
+        # If args.path looks like a glob (contains *?[), expand it
+        # Otherwise treat as a folder list unless it's a file
+        import fnmatch
+        path_arg = args.path
+
+        is_pattern = any(char in path_arg for char in ['*', '?', '['])
+
+        # Get filters
+        include = getattr(args, 'include', []) or []
+        exclude = getattr(args, 'exclude', []) or []
+
+        if is_pattern:
+            # Case A: "ls *.txt" -> List matches
+            items = self._expand_remote_path(path_arg)
+            # Apply filters
+            filtered = [i for i in items if self._should_process_item(i['name'], include, exclude)]
+
+            if not filtered:
+                print(f"📭 No items found matching '{path_arg}'")
                 return 0
-            else:
-                # Case B: Standard folder list "ls /Docs"
-                # Resolve strictly first
-                resolved = self.drive.resolve_path(path_arg)
-                
-                if resolved['type'] == 'file':
-                    # Check filters for single file
-                    if not self._should_process_item(resolved['metadata']['name'], include, exclude):
-                        print("🚫 File filtered out")
-                        return 0
-                    print(f"📄 File: {resolved['metadata']['name']} ({resolved['uuid']})")
-                    return 0
-                
-                # It's a folder, list contents
-                uuid = resolved['uuid']
-                print(f"📂 {resolved['path']} (UUID: {uuid[:8]}...)\n")
-                
-                folders = self.drive.list_folders(uuid, detailed=args.detailed)
-                files = self.drive.list_files(uuid, detailed=args.detailed)
-                all_items = folders + files
-                
-                # Filter contents
-                filtered = [i for i in all_items if self._should_process_item(i['name'], include, exclude)]
-                
-                if not filtered:
-                    print("   (empty or all items filtered)")
+
+            print(f"🔍 Found {len(filtered)} items matching '{path_arg}':\n")
+            self._print_item_list(filtered, args.detailed, args.uuids)
+            return 0
+        else:
+            # Case B: Standard folder list "ls /Docs"
+            # Resolve strictly first
+            resolved = self.drive.resolve_path(path_arg)
+
+            if resolved['type'] == 'file':
+                # Check filters for single file
+                if not self._should_process_item(resolved['metadata']['name'], include, exclude):
+                    print("🚫 File filtered out")
                     return 0
-                
-                self._print_item_list(filtered, args.detailed, args.uuids)
+                print(f"📄 File: {resolved['metadata']['name']} ({resolved['uuid']})")
                 return 0
 
-        except Exception as e:
-            print(f"❌ List failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+            # It's a folder, list contents
+            uuid = resolved['uuid']
+            print(f"📂 {resolved['path']} (UUID: {uuid[:8]}...)\n")
+
+            folders = self.drive.list_folders(uuid, detailed=args.detailed)
+            files = self.drive.list_files(uuid, detailed=args.detailed)
+
+            # Filter and render lazily - no concatenated copy of the
+            # full listing is built for large folders
+            from itertools import chain
+            filtered = (i for i in chain(folders, files)
+                        if self._should_process_item(i['name'], include, exclude))
+
+            first = next(filtered, None)
+            if first is None:
+                print("   (empty or all items filtered)")
+                return 0
+
+            self._print_item_list(chain([first], filtered), args.detailed, args.uuids)
+            return 0
 
     def _print_item_list(self, items, detailed, show_uuids):
-        """Helper to print table of items"""
-        name_width = 40
-        size_width = 12
-        date_width = 16
+        """Helper to print table of items.
+
+        `items` may be any iterable; rows are rendered as it is consumed
+        and flushed in batches, so large listings never need to be fully
+        materialized.
+        """
+        from services.drive import format_size, format_date
+
+        name_width = _TABLE_NAME_WIDTH
+        size_width = _TABLE_SIZE_WIDTH
+        date_width = _TABLE_DATE_WIDTH
         uuid_width = 36 if show_uuids else 11
-        
-        if detailed:
-            top = f"╔{'═' * 9}{'═' * name_width}{'═' * (size_width + 2)}{'═' * (date_width + 2)}{'═' * (uuid_width + 2)}╗"
-            header = f"║  Type    {'Name'.ljust(name_width)}  {'Size'.rjust(size_width)}  {'Modified'.rjust(date_width)}  {'UUID'.ljust(uuid_width)} ║"
-            sep = f"╠{'═' * 9}{'═' * name_width}{'═' * (size_width + 2)}{'═' * (date_width + 2)}{'═' * (uuid_width + 2)}╣"
-            footer = f"╚{'═' * 9}{'═' * name_width}{'═' * (size_width + 2)}{'═' * (date_width + 2)}{'═' * (uuid_width + 2)}╝"
-        else:
-            top = f"╔{'═' * 9}{'═' * name_width}{'═' * (size_width + 2)}{'═' * (uuid_width + 2)}╗"
-            header = f"║  Type    {'Name'.ljust(name_width)}  {'Size'.rjust(size_width)}  {'UUID'.ljust(uuid_width)} ║"
-            sep = f"╠{'═' * 9}{'═' * name_width}{'═' * (size_width + 2)}{'═' * (uuid_width + 2)}╣"
-            footer = f"╚{'═' * 9}{'═' * name_width}{'═' * (size_width + 2)}{'═' * (uuid_width + 2)}╝"
-        
-        print(top)
-        print(header)
-        print(sep)
-        
+
+        top, header, sep, footer = _TABLE_BORDERS[(detailed, show_uuids)]
+
+        lines = [top, header, sep]
+
         folder_count = 0
         file_count = 0
-        
+
         for item in items:
             is_folder = item.get('type') == 'folder' or item.get('itemType') == 'folder'
             icon = '📁' if is_folder else '📄'
             if is_folder: folder_count += 1
             else: file_count += 1
-            
+
             name = item.get('name', 'Unknown')
             if len(name) > name_width:
                 name = name[:name_width - 3] + '...'
-            name = name.ljust(name_width)
-            
+
             size = '<DIR>' if is_folder else format_size(item.get('size', 0))
-            size = size.rjust(size_width)
-            
+
             item_uuid = item.get('uuid', item.get('itemId', 'N/A'))
-            uuid_display = (item_uuid if show_uuids else f"{item_uuid[:8]}...").ljust(uuid_width)
-            
+            uuid_display = item_uuid if show_uuids else f"{item_uuid[:8]}..."
+
+            # Format-spec padding: one C-level format per field instead
+            # of a ljust/rjust method call each
             if detailed:
                 mod_raw = item.get('lastModified', item.get('timestamp', 0))
-                date_display = format_date(mod_raw).rjust(date_width)
-                print(f"║  {icon}  {name}  {size}  {date_display}  {uuid_display} ║")
+                date_display = format_date(mod_raw)
+                lines.append(f"║  {icon}  {name:<{name_width}}  {size:>{size_width}}  "
+                             f"{date_display:>{date_width}}  {uuid_display:<{uuid_width}} ║")
             else:
-                print(f"║  {icon}  {name}  {size}  {uuid_display} ║")
-        
-        print(footer)
-        print(f"\n📊 Total: {len(items)} items ({folder_count} folders, {file_count} files)")
+                lines.append(f"║  {icon}  {name:<{name_width}}  {size:>{size_width}}  "
+                             f"{uuid_display:<{uuid_width}} ║")
 
+            if len(lines) >= 512:
+                sys.stdout.write("\n".join(lines) + "\n")
+                lines = []
 
+        total = folder_count + file_count
+        lines.append(footer)
+        lines.append(f"\n📊 Total: {total} items ({folder_count} folders, {file_count} files)\n")
+
+        # Buffered writes instead of a print per row
+        sys.stdout.write("\n".join(lines))
+
+
+    @_requires_client()
+    @_handles_errors('Mkdir')
     def handle_mkdir(self, args) -> int:
         """Handle mkdir command"""
-        try:
-            self._prepare_client()
-            
-            print(f"📂 Creating \"{args.path}\"...")
-            result = self.drive.create_folder_recursive(args.path)
-            print("✅ Folder created successfully")
-            
-            return 0
-        except Exception as e:
-            print(f"❌ Mkdir failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+        print(f"📂 Creating \"{args.path}\"...")
+        result = self.drive.create_folder_recursive(args.path)
+        print("✅ Folder created successfully")
 
+        return 0
+    @_requires_client(validate_session=True)
+    @_handles_errors('Upload')
     def handle_upload(self, args) -> int:
         """Handle upload command with batching and resume"""
-        try:
-            # Fix for "upload src dest" pattern (e.g. 'filen upload "*.pdf" /texte')
-            # If target is default ('/') and we have multiple items in sources,
-            # we check if the last item is intended as a destination.
-            if args.target == '/' and len(args.sources) > 1:
-                potential_dest = args.sources[-1]
-                
-                # Heuristic: It's a target if it starts with '/' (remote path)
-                # OR if it doesn't exist locally (so it's not a source file)
-                if potential_dest.startswith('/') or not os.path.exists(potential_dest):
-                    args.target = potential_dest
-                    args.sources = args.sources[:-1]
-                    print(f"ℹ️  Inferring target: {args.target}")
-
-            # Validate session for long-running operation
-            self._prepare_client(validate_session=True)
-            
-            # Generate batch ID
-            batch_id = self.config.generate_batch_id('upload', args.sources, args.target)
-            print(f"🔄 Batch ID: {batch_id}")
-            print(f"🎯 Target: {args.target}")
-            
-            # Load batch state
-            batch_state = self.config.load_batch_state(batch_id)
-            
-            # Upload
-            self.drive.upload(
-                args.sources,
-                args.target,
-                recursive=args.recursive,
-                on_conflict=args.on_conflict,
-                preserve_timestamps=args.preserve_timestamps,
-                include=args.include or [],
-                exclude=args.exclude or [],
-                batch_id=batch_id,
-                initial_batch_state=batch_state,
-                save_state_callback=lambda state: self.config.save_batch_state(batch_id, state)
-            )
-            
-            # Clean up batch state
-            self.config.delete_batch_state(batch_id)
-            print("✅ Upload batch completed successfully")
-            
-            return 0
-        
-        except Exception as e:
-            print(f"❌ Upload failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+        # Fix for "upload src dest" pattern (e.g. 'filen upload "*.pdf" /texte')
+        # If target is default ('/') and we have multiple items in sources,
+        # we check if the last item is intended as a destination.
+        if args.target == '/' and len(args.sources) > 1:
+            potential_dest = args.sources[-1]
+
+            # Heuristic: It's a target if it starts with '/' (remote path)
+            # OR if it doesn't exist locally (so it's not a source file)
+            if potential_dest.startswith('/') or not os.path.exists(potential_dest):
+                args.target = potential_dest
+                args.sources = args.sources[:-1]
+                print(f"ℹ️  Inferring target: {args.target}")
+
+        # Generate batch ID
+        batch_id = self.config.generate_batch_id('upload', args.sources, args.target)
+        print(f"🔄 Batch ID: {batch_id}")
+        print(f"🎯 Target: {args.target}")
+
+        # Load batch state
+        batch_state = self.config.load_batch_state(batch_id)
 
+        # Upload
+        self.drive.upload(
+            args.sources,
+            args.target,
+            recursive=args.recursive,
+            on_conflict=args.on_conflict,
+            preserve_timestamps=args.preserve_timestamps,
+            include=args.include or [],
+            exclude=args.exclude or [],
+            batch_id=batch_id,
+            initial_batch_state=batch_state,
+            save_state_callback=lambda state: self.config.save_batch_state(batch_id, state)
+        )
+
+        # Clean up batch state
+        self.config.delete_batch_state(batch_id)
+        print("✅ Upload batch completed successfully")
+
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Download')
     def handle_download(self, args) -> int:
         """Handle download command"""
+        # Check if UUID or path
+        input_str = args.path
+        is_uuid = _is_uuid(input_str)
+
+        if is_uuid:
+            file_uuid = input_str
+            filename = args.output or 'file'
+        else:
+            resolved = self.drive.resolve_path(input_str)
+            if resolved['type'] != 'file':
+                print(f"❌ Not a file: {input_str}")
+                return 1
+            file_uuid = resolved['uuid']
+            filename = args.output or posixpath.basename(input_str)
+
+        # Check conflict (single stat; os.path.exists would add
+        # a second filesystem round trip on network mounts)
         try:
-            self._prepare_client()
-            
-            # Check if UUID or path
-            input_str = args.path
-            is_uuid = (input_str.count('-') == 4 and len(input_str) == 36)
-            
-            if is_uuid:
-                file_uuid = input_str
-                filename = args.output or 'file'
+            os.stat(filename)
+            exists = True
+        except OSError:
+            exists = False
+
+        if exists:
+            if args.on_conflict == 'skip':
+                print(f"⏭️  Skipping: {filename} (exists)")
+                return 0
+            elif args.on_conflict == 'overwrite' or self.force:
+                print(f"⚠️  File exists, overwriting")
             else:
-                resolved = self.drive.resolve_path(input_str)
-                if resolved['type'] != 'file':
-                    print(f"❌ Not a file: {input_str}")
-                    return 1
-                file_uuid = resolved['uuid']
-                filename = args.output or os.path.basename(input_str)
-            
-            # Check conflict
-            if os.path.exists(filename):
-                if args.on_conflict == 'skip':
-                    print(f"⏭️  Skipping: {filename} (exists)")
+                if not self._confirm_yes(f"⚠️  File \"{filename}\" exists. Overwrite? [y/N]: "):
+                    print("❌ Download cancelled")
                     return 0
-                elif args.on_conflict == 'overwrite' or self.force:
-                    print(f"⚠️  File exists, overwriting")
-                else:
-                    response = input(f"⚠️  File \"{filename}\" exists. Overwrite? [y/N]: ")
-                    if response.lower() not in ['y', 'yes']:
-                        print("❌ Download cancelled")
-                        return 0
-            
-            print(f"📥 Downloading file...")
-            
-            result = self.drive.download_file(file_uuid, save_path=filename)
-            
-            print(f"✅ Downloaded: {result['filename']} ({format_size(result['size'])})")
-            
-            return 0
-        
-        except Exception as e:
-            print(f"❌ Download failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
 
+        print(f"📥 Downloading file...")
+
+        result = self.drive.download_file(file_uuid, save_path=filename)
+
+        from services.drive import format_size
+        print(f"✅ Downloaded: {result['filename']} ({format_size(result['size'])})")
+
+        return 0
+
+    @_requires_client(validate_session=True)
+    @_handles_errors('Download')
     def handle_download_path(self, args) -> int:
         """Handle download-path with optional positional destination"""
-        try:
-            self._prepare_client(validate_session=True)
-            
-            # PARSING LOGIC:
-            remote_patterns = args.paths
-            local_target = args.target
-
-            # Heuristic: If target flag NOT set, check if last arg looks like a local path
-            if not local_target:
-                if len(args.paths) > 1:
-                    # Assume last arg is local destination
-                    local_target = args.paths[-1]
-                    remote_patterns = args.paths[:-1]
-                else:
-                    # Only one arg provided, default to current dir
-                    local_target = '.'
-            
-            # 1. Expand Remote Sources
-            items_to_process = []
-            include = getattr(args, 'include', []) or []
-            exclude = getattr(args, 'exclude', []) or []
-
-            for pattern in remote_patterns:
-                expanded = self._expand_remote_path(pattern)
-                filtered = [i for i in expanded if self._should_process_item(i['name'], include, exclude)]
-                items_to_process.extend(filtered)
-
-            if not items_to_process:
-                print(f"❌ No items found matching: {remote_patterns}")
-                return 1
+        # PARSING LOGIC:
+        remote_patterns = args.paths
+        local_target = args.target
+
+        # Heuristic: If target flag NOT set, check if last arg looks like a local path
+        if not local_target:
+            if len(args.paths) > 1:
+                # Assume last arg is local destination
+                local_target = args.paths[-1]
+                remote_patterns = args.paths[:-1]
+            else:
+                # Only one arg provided, default to current dir
+                local_target = '.'
 
-            # 2. Prepare Destination
-            if len(items_to_process) > 1 and not os.path.isdir(local_target):
-                # If downloading multiple, force target to be a directory
-                os.makedirs(local_target, exist_ok=True)
+        # 1. Expand Remote Sources
+        items_to_process = []
+        include = getattr(args, 'include', []) or []
+        exclude = getattr(args, 'exclude', []) or []
 
-            print(f"📥 Downloading {len(items_to_process)} items to '{local_target}'...")
+        for pattern in remote_patterns:
+            expanded = self._expand_remote_path(pattern)
+            filtered = [i for i in expanded if self._should_process_item(i['name'], include, exclude)]
+            items_to_process.extend(filtered)
 
-            # 3. Execute Batch
-            # Generate batch ID for resume capability
-            batch_id = self.config.generate_batch_id('download', [i['path'] for i in items_to_process], local_target)
-            batch_state = self.config.load_batch_state(batch_id)
+        if not items_to_process:
+            print(f"❌ No items found matching: {remote_patterns}")
+            return 1
 
-            success = 0
-            for item in items_to_process:
-                try:
-                    # Recursive download for folders
-                    if item['type'] == 'folder':
-                        self.drive.download_path(
-                            item['path'],
-                            local_destination=local_target,
-                            recursive=args.recursive,
-                            on_conflict=args.on_conflict,
-                            preserve_timestamps=args.preserve_timestamps,
-                            include=include,
-                            exclude=exclude
-                        )
-                        success += 1
+        # 2. Prepare Destination
+        if len(items_to_process) > 1 and not os.path.isdir(local_target):
+            # If downloading multiple, force target to be a directory
+            os.makedirs(local_target, exist_ok=True)
+
+        print(f"📥 Downloading {len(items_to_process)} items to '{local_target}'...")
+
+        # 3. Execute Batch
+        # Generate batch ID for resume capability
+        batch_id = self.config.generate_batch_id('download', [i['path'] for i in items_to_process], local_target)
+        batch_state = self.config.load_batch_state(batch_id)
+
+        drive = self.drive  # local alias for the hot loop
+        success = 0
+        for item in items_to_process:
+            try:
+                # Recursive download for folders
+                if item['type'] == 'folder':
+                    drive.download_path(
+                        item['path'],
+                        local_destination=local_target,
+                        recursive=args.recursive,
+                        on_conflict=args.on_conflict,
+                        preserve_timestamps=args.preserve_timestamps,
+                        include=include,
+                        exclude=exclude
+                    )
+                    success += 1
+                else:
+                    # Single file download
+                    # If target is dir, join path. If file, use as is (only if 1 item)
+                    if os.path.isdir(local_target):
+                        save_path = os.path.join(local_target, item['name'])
                     else:
-                        # Single file download
-                        # If target is dir, join path. If file, use as is (only if 1 item)
-                        if os.path.isdir(local_target):
-                            save_path = os.path.join(local_target, item['name'])
-                        else:
-                            save_path = local_target
-
-                        self.drive.download_file(
-                            item['uuid'],
-                            save_path=save_path,
-                            preserve_timestamps=args.preserve_timestamps
-                        )
-                        success += 1
-                        print(f"  ✅ {item['name']}")
-                
-                except Exception as e:
-                    print(f"  ❌ Error downloading {item['name']}: {e}")
+                        save_path = local_target
+
+                    drive.download_file(
+                        item['uuid'],
+                        save_path=save_path,
+                        preserve_timestamps=args.preserve_timestamps
+                    )
+                    success += 1
+                    print(f"  ✅ {item['name']}")
 
-            # Cleanup
-            if success == len(items_to_process):
-                self.config.delete_batch_state(batch_id)
+            except Exception as e:
+                print(f"  ❌ Error downloading {item['name']}: {e}")
 
-            return 0
-            
-        except Exception as e:
-            print(f"❌ Download failed: {e}")
-            return 1
+        # Cleanup
+        if success == len(items_to_process):
+            self.config.delete_batch_state(batch_id)
+
+        return 0
 
     def handle_move(self, args) -> int:
         """Handle move command with multi-source support"""
@@ -916,388 +1210,425 @@ WebDAV Examples:
         """Handle copy command with multi-source support"""
         return self._handle_transfer('copy', args)
 
+    @_requires_client()
+    @_handles_errors('Operation')
     def _handle_transfer(self, mode: str, args) -> int:
         """Shared logic for mv/cp with 'last arg is destination' logic"""
+        # PARSING LOGIC:
+        if len(args.paths) < 2:
+            print(f"❌ Error: {mode} requires at least a source and a destination.")
+            return 1
+
+        # Last argument is ALWAYS destination
+        dest_path_raw = args.paths[-1]
+        source_patterns = args.paths[:-1]
+
+        # Destination resolution is independent of source expansion, so
+        # start it now and overlap the two round-trips
+        from concurrent.futures import ThreadPoolExecutor
+        dest_pool = ThreadPoolExecutor(max_workers=1)
+        dest_future = dest_pool.submit(self.drive.resolve_path, dest_path_raw)
+        dest_pool.shutdown(wait=False)
+
+        # 1. Expand all Source Patterns
+        all_items_to_process = []
+        include = getattr(args, 'include', []) or []
+        exclude = getattr(args, 'exclude', []) or []
+
+        for pattern in source_patterns:
+            expanded = self._expand_remote_path(pattern)
+            # Filter
+            filtered = [i for i in expanded if self._should_process_item(i['name'], include, exclude)]
+            all_items_to_process.extend(filtered)
+
+        if not all_items_to_process:
+            dest_future.cancel()
+            print(f"❌ No items found matching sources: {source_patterns}")
+            return 1
+
+        # 2. Resolve Destination
+        # If multiple items, destination MUST be a folder
         try:
-            self._prepare_client()
-            
-            # PARSING LOGIC:
-            if len(args.paths) < 2:
-                print(f"❌ Error: {mode} requires at least a source and a destination.")
-                return 1
-            
-            # Last argument is ALWAYS destination
-            dest_path_raw = args.paths[-1]
-            source_patterns = args.paths[:-1]
-            
-            # 1. Expand all Source Patterns
-            all_items_to_process = []
-            include = getattr(args, 'include', []) or []
-            exclude = getattr(args, 'exclude', []) or []
-
-            for pattern in source_patterns:
-                expanded = self._expand_remote_path(pattern)
-                # Filter
-                filtered = [i for i in expanded if self._should_process_item(i['name'], include, exclude)]
-                all_items_to_process.extend(filtered)
-            
-            if not all_items_to_process:
-                print(f"❌ No items found matching sources: {source_patterns}")
-                return 1
-            
-            # 2. Resolve Destination
-            # If multiple items, destination MUST be a folder
-            try:
-                dest = self.drive.resolve_path(dest_path_raw)
-                
-                if len(all_items_to_process) > 1 and dest['type'] != 'folder':
-                     print(f"❌ Destination '{dest_path_raw}' must be a folder when processing multiple items.")
-                     return 1
-                     
+            dest = dest_future.result()
+
+            if len(all_items_to_process) > 1 and dest['type'] != 'folder':
+                 print(f"❌ Destination '{dest_path_raw}' must be a folder when processing multiple items.")
+                 return 1
+
+            dest_uuid = dest['uuid']
+
+        except FileNotFoundError:
+            # If destination doesn't exist...
+            if len(all_items_to_process) > 1 or dest_path_raw.endswith('/'):
+                # We are moving multiple things, so we create the folder
+                print(f"📂 Creating destination folder '{dest_path_raw}'...")
+                dest = self.drive.create_folder_recursive(dest_path_raw)
                 dest_uuid = dest['uuid']
-                
-            except FileNotFoundError:
-                # If destination doesn't exist...
-                if len(all_items_to_process) > 1 or dest_path_raw.endswith('/'):
-                    # We are moving multiple things, so we create the folder
-                    print(f"📂 Creating destination folder '{dest_path_raw}'...")
-                    dest = self.drive.create_folder_recursive(dest_path_raw)
-                    dest_uuid = dest['uuid']
-                else:
-                    # Single item rename/move scenario
-                    # We need the PARENT of the non-existent destination
-                    parent_path = os.path.dirname(dest_path_raw)
-                    if not parent_path: parent_path = '/'
-                    
-                    try:
-                        parent_dest = self.drive.resolve_path(parent_path)
-                        dest_uuid = parent_dest['uuid']
-                        # For single file rename/move, we might handle it differently, 
-                        # but standard API move is UUID->UUID. 
-                        # If the user wants to RENAME, they should use 'rename' command or we implement implicit rename here.
-                        # For simplicity in this logic, we assume standard folder-to-folder move.
-                        if mode == 'move':
-                            print(f"ℹ️  To rename a file, use the 'rename' command.")
-                            print(f"❌ Destination folder '{dest_path_raw}' not found.")
-                            return 1
-                        else:
-                            print(f"❌ Destination folder '{dest_path_raw}' not found.")
-                            return 1
-                    except FileNotFoundError:
-                        print(f"❌ Destination path '{dest_path_raw}' invalid.")
-                        return 1
+            else:
+                # Single item rename/move scenario
+                # We need the PARENT of the non-existent destination
+                parent_path = posixpath.dirname(dest_path_raw)
+                if not parent_path: parent_path = '/'
 
-            # 3. Execute
-            success_count = 0
-            action_name = "Moving" if mode == 'move' else "Copying"
-            
-            print(f"📦 {action_name} {len(all_items_to_process)} items to '{dest_path_raw}'...")
-            
-            for item in all_items_to_process:
                 try:
+                    parent_dest = self.drive.resolve_path(parent_path)
+                    dest_uuid = parent_dest['uuid']
+                    # For single file rename/move, we might handle it differently, 
+                    # but standard API move is UUID->UUID. 
+                    # If the user wants to RENAME, they should use 'rename' command or we implement implicit rename here.
+                    # For simplicity in this logic, we assume standard folder-to-folder move.
                     if mode == 'move':
-                        self.drive.move_item(item['uuid'], dest_uuid, item['type'])
+                        print(f"ℹ️  To rename a file, use the 'rename' command.")
+                        print(f"❌ Destination folder '{dest_path_raw}' not found.")
+                        return 1
                     else:
-                        if item['type'] == 'folder':
-                            print(f"⚠️  Skipping folder '{item['name']}' (Folder copy not supported)")
-                            continue
-                        self.drive.copy_file(item['uuid'], dest_uuid, item['name'])
-                    
-                    print(f"  ✅ {item['name']}")
-                    success_count += 1
-                except Exception as e:
-                    print(f"  ❌ Error processing {item['name']}: {e}")
+                        print(f"❌ Destination folder '{dest_path_raw}' not found.")
+                        return 1
+                except FileNotFoundError:
+                    print(f"❌ Destination path '{dest_path_raw}' invalid.")
+                    return 1
 
-            print(f"✅ {action_name} completed. ({success_count}/{len(all_items_to_process)} successful)")
-            return 0
-            
-        except Exception as e:
-            print(f"❌ Operation failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+        # 3. Execute
+        drive = self.drive  # local alias for the hot loop
+        success_count = 0
+        action_name = "Moving" if mode == 'move' else "Copying"
+
+        print(f"📦 {action_name} {len(all_items_to_process)} items to '{dest_path_raw}'...")
+
+        for item in all_items_to_process:
+            try:
+                if mode == 'move':
+                    # No-op move fast path: already in the destination
+                    if item.get('parent') == dest_uuid:
+                        print(f"  ⏭️  {item['name']} (already in destination)")
+                        success_count += 1
+                        continue
+                    drive.move_item(item['uuid'], dest_uuid, item['type'])
+                else:
+                    if item['type'] == 'folder':
+                        print(f"⚠️  Skipping folder '{item['name']}' (Folder copy not supported)")
+                        continue
+                    drive.copy_file(item['uuid'], dest_uuid, item['name'])
+
+                print(f"  ✅ {item['name']}")
+                success_count += 1
+            except Exception as e:
+                print(f"  ❌ Error processing {item['name']}: {e}")
 
+        print(f"✅ {action_name} completed. ({success_count}/{len(all_items_to_process)} successful)")
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Rename')
     def handle_rename(self, args) -> int:
         """Handle rename command"""
-        try:
-            self._prepare_client()
-            
-            src = self.drive.resolve_path(args.path)
-            
-            print(f"✏️ Renaming \"{src['path']}\" to \"{args.new_name}\"...")
-            
-            self.drive.rename_item(src['uuid'], args.new_name, src['type'], src['metadata'])
-            
-            print("✅ Rename completed successfully")
-            return 0
-        
-        except Exception as e:
-            print(f"❌ Rename failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+        src = self.drive.resolve_path(args.path)
+
+        print(f"✏️ Renaming \"{src['path']}\" to \"{args.new_name}\"...")
 
+        self.drive.rename_item(src['uuid'], args.new_name, src['type'], src['metadata'])
+
+        print("✅ Rename completed successfully")
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Tree')
     def handle_tree(self, args) -> int:
         """Handle tree command - OPTIMIZED"""
-        try:
-            self._prepare_client()
-            
-            print(f"\n🌳 Folder tree: {args.path}")
-            print("=" * 60)
-            print(args.path if args.path == '/' else f"📁 {os.path.basename(args.path)}")
-            
-            # Now calls the optimized method in drive.py
-            self.drive.print_tree(
-                args.path,
-                lambda line: print(line),
-                max_depth=args.depth
-            )
-            
-            print(f"\n(Showing max {args.depth} levels deep)")
-            return 0
-        
-        except Exception as e:
-            print(f"❌ Tree failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+        print(f"\n🌳 Folder tree: {args.path}")
+        print("=" * 60)
+        print(args.path if args.path == '/' else f"📁 {os.path.basename(args.path)}")
+
+        # Now calls the optimized method in drive.py
+        self.drive.print_tree(
+            args.path,
+            lambda line: print(line),
+            max_depth=args.depth
+        )
 
+        print(f"\n(Showing max {args.depth} levels deep)")
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Search')
     def handle_search(self, args) -> int:
         """Handle search command (Global) - OPTIMIZED"""
-        try:
-            self._prepare_client()
-            
-            print(f"🔍 Searching for \"*{args.query}*\"...")
-            
-            # Use optimized find_files on root
-            # Note: This fetches the whole drive tree once, which is much faster 
-            # than 500 API calls, even for large accounts.
-            results = self.drive.find_files('/', f'*{args.query}*')
-            
-            # Apply Filters (Client side)
-            include = getattr(args, 'include', []) or []
-            exclude = getattr(args, 'exclude', []) or []
-            
-            filtered = []
-            for item in results:
-                if self._should_process_item(item['name'], include, exclude):
-                    filtered.append(item)
-
-            if not filtered:
-                print("   No matches found")
-                return 0
-                
-            print(f"\nFound {len(filtered)} matches:")
-            for item in filtered:
-                uuid_str = f" ({item['uuid']})" if args.uuids else ""
-                print(f"   {item['fullPath']}{uuid_str}")
-                
+        print(f"🔍 Searching for \"*{args.query}*\"...")
+
+        # Use optimized iter_find_files on root
+        # Note: This fetches the whole drive tree once, which is much faster
+        # than 500 API calls, even for large accounts.
+        results = self.drive.iter_find_files('/', f'*{args.query}*')
+
+        # Apply Filters (Client side) and stream matches as they come
+        include = getattr(args, 'include', []) or []
+        exclude = getattr(args, 'exclude', []) or []
+
+        count = 0
+        lines = []
+        for item in results:
+            if not self._should_process_item(item['name'], include, exclude):
+                continue
+            count += 1
+            uuid_str = f" ({item['uuid']})" if args.uuids else ""
+            lines.append(f"   {item['fullPath']}{uuid_str}")
+            if len(lines) >= 256:
+                sys.stdout.write("\n".join(lines) + "\n")
+                lines = []
+
+        if count == 0:
+            print("   No matches found")
             return 0
-            
-        except Exception as e:
-            print(f"❌ Search failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
 
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+        print(f"\nFound {count} matches")
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Find')
     def handle_find(self, args) -> int:
         """Handle find command - OPTIMIZED"""
-        try:
-            self._prepare_client()
-            
-            print(f"🔍 Finding \"{args.pattern}\" in \"{args.path}\"...")
-            
-            # Calls optimized drive method
-            results = self.drive.find_files(
-                args.path, 
-                args.pattern, 
-                max_depth=args.maxdepth
-            )
-            
-            # Apply Filters (Client side)
-            include = getattr(args, 'include', []) or []
-            exclude = getattr(args, 'exclude', []) or []
-            
-            filtered = [i for i in results if self._should_process_item(i['name'], include, exclude)]
-            
-            if not filtered:
-                print("   No matches found")
-                return 0
-                
-            print(f"\nFound {len(filtered)} matches:")
-            for item in filtered:
-                print(f"   {item['fullPath']}")
-                
+        print(f"🔍 Finding \"{args.pattern}\" in \"{args.path}\"...")
+
+        # Calls optimized drive iterator and streams matches
+        results = self.drive.iter_find_files(
+            args.path,
+            args.pattern,
+            max_depth=args.maxdepth
+        )
+
+        # Apply Filters (Client side)
+        include = getattr(args, 'include', []) or []
+        exclude = getattr(args, 'exclude', []) or []
+
+        count = 0
+        lines = []
+        for item in results:
+            if not self._should_process_item(item['name'], include, exclude):
+                continue
+            count += 1
+            lines.append(f"   {item['fullPath']}")
+            if len(lines) >= 256:
+                sys.stdout.write("\n".join(lines) + "\n")
+                lines = []
+
+        if count == 0:
+            print("   No matches found")
             return 0
-            
-        except Exception as e:
-            print(f"❌ Find failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
 
-    def handle_delete(self, args) -> int:
-        """Handle delete-path command with wildcards"""
-        try:
-            self._prepare_client()
-            
-            # 1. Expand
-            items = self._expand_remote_path(args.path)
-            
-            include = getattr(args, 'include', []) or []
-            exclude = getattr(args, 'exclude', []) or []
-            
-            # 2. Filter
-            items_to_process = []
-            for item in items:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+        print(f"\nFound {count} matches")
+        return 0
+
+    @_requires_client()
+    def _expand_and_filter_paths(self, patterns: list, args) -> list:
+        """Expand remote patterns and apply include/exclude filters"""
+        include = getattr(args, 'include', []) or []
+        exclude = getattr(args, 'exclude', []) or []
+
+        items = []
+        for pattern in patterns:
+            for item in self._expand_remote_path(pattern):
                 if self._should_process_item(item['name'], include, exclude):
-                    items_to_process.append(item)
-            
-            if not items_to_process:
-                print(f"❌ No items found matching '{args.path}'")
-                return 1
+                    items.append(item)
+        return items
 
-            # 3. Confirmation
-            print("⚠️  WARNING: PERMANENT DELETION detected!")
-            print(f"🔍 Found {len(items_to_process)} items to DELETE PERMANENTLY:")
-            for item in items_to_process[:5]:
-                print(f"  🔥 {item['path']}")
-            if len(items_to_process) > 5:
-                print(f"  ... {len(items_to_process) - 5} more")
-
-            if not self.force:
-                response = input("❓ Type 'DELETE' to confirm permanent deletion: ")
-                if response != 'DELETE':
-                    print("❌ Cancelled")
-                    return 0
+    def _run_item_batch(self, items: list, action, icon: str) -> int:
+        """Run action(item) across items concurrently; returns success count.
 
-            # 4. Execution
-            success_count = 0
-            for item in items_to_process:
+        Mutations are independent single RPCs, so a small thread pool
+        overlaps their TLS round-trips instead of paying them serially.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        success_count = 0
+        with ThreadPoolExecutor(max_workers=min(8, len(items))) as pool:
+            futures = {pool.submit(action, item): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
                 try:
-                    print(f"🔥 Deleting \"{item['path']}\"...")
-                    self.drive.delete_permanent(item['uuid'], item['type'])
+                    future.result()
+                    print(f"  {icon} {item['path']}")
                     success_count += 1
                 except Exception as e:
-                    print(f"❌ Error deleting {item['name']}: {e}")
+                    print(f"  ❌ Error processing {item['name']}: {e}")
+        return success_count
+
+    @_requires_client()
+    @_handles_errors('Trash')
+    def handle_trash(self, args) -> int:
+        """Handle trash command with wildcards and batched execution"""
+        # 1. Expand + filter
+        items_to_process = self._expand_and_filter_paths(args.paths, args)
+
+        # Folders matched via wildcard need -r to be trashed
+        if not args.recursive and any('*' in p or '?' in p or '[' in p for p in args.paths):
+            folders = [i for i in items_to_process if i['type'] == 'folder']
+            if folders:
+                for item in folders:
+                    print(f"⚠️  Skipping folder '{item['name']}' (use -r to trash folders via wildcard)")
+                items_to_process = [i for i in items_to_process if i['type'] != 'folder']
+
+        if not items_to_process:
+            print(f"❌ No items found matching {args.paths}")
+            return 1
 
-            print(f"✅ Permanently deleted {success_count} items")
+        # 2. Confirmation
+        print(f"🔍 Found {len(items_to_process)} items to move to trash:")
+        for item in items_to_process[:5]:
+            print(f"  🗑️  {item['path']}")
+        if len(items_to_process) > 5:
+            print(f"  ... {len(items_to_process) - 5} more")
+
+        if not self._confirm_yes(f"❓ Move {len(items_to_process)} item(s) to trash? [y/N]: "):
+            print("❌ Cancelled")
             return 0
-        
-        except Exception as e:
-            print(f"❌ Delete failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
+
+        # 3. Execution (concurrent; one RPC per item)
+        drive = self.drive
+        success_count = self._run_item_batch(
+            items_to_process,
+            lambda item: drive.trash_item(item['uuid'], item['type']),
+            '🗑️')
+
+        self._trash_index = None
+        print(f"✅ Moved {success_count} items to trash")
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Delete')
+    def handle_delete(self, args) -> int:
+        """Handle delete-path command with wildcards"""
+        # 1. Expand + filter
+        items_to_process = self._expand_and_filter_paths(args.paths, args)
+
+        if not items_to_process:
+            print(f"❌ No items found matching {args.paths}")
             return 1
 
+        # 2. Confirmation
+        print("⚠️  WARNING: PERMANENT DELETION detected!")
+        print(f"🔍 Found {len(items_to_process)} items to DELETE PERMANENTLY:")
+        for item in items_to_process[:5]:
+            print(f"  🔥 {item['path']}")
+        if len(items_to_process) > 5:
+            print(f"  ... {len(items_to_process) - 5} more")
+
+        if not self.force:
+            if not sys.stdin.isatty():
+                print("❌ Non-interactive session, refusing without -f (or FILEN_FORCE=1)")
+                return 1
+            response = input("❓ Type 'DELETE' to confirm permanent deletion: ")
+            if response != 'DELETE':
+                print("❌ Cancelled")
+                return 0
+
+        # 3. Execution (concurrent; one RPC per item)
+        drive = self.drive
+        success_count = self._run_item_batch(
+            items_to_process,
+            lambda item: drive.delete_permanent(item['uuid'], item['type']),
+            '🔥')
+
+        print(f"✅ Permanently deleted {success_count} items")
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Verification')
     def handle_verify(self, args) -> int:
         """Handle verify command"""
-        try:
-            self._prepare_client()
-            
-            # Check if UUID or path
-            input_str = args.remote
-            is_uuid = (input_str.count('-') == 4 and len(input_str) == 36)
-            
-            if is_uuid:
-                file_uuid = input_str
-                print("🔍 Verifying upload by UUID")
-                print(f"   Remote UUID: {file_uuid}")
-                print(f"   Local file: {args.local}")
-                print()
-            else:
-                print(f"🔍 Resolving remote path: {input_str}")
-                resolved = self.drive.resolve_path(input_str)
-                
-                if resolved['type'] != 'file':
-                    print(f"❌ Error: \"{input_str}\" is not a file")
-                    return 1
-                
-                file_uuid = resolved['uuid']
-                print(f"   ✅ Resolved to UUID: {file_uuid}")
-                print(f"   Local file: {args.local}")
-                print()
-            
-            match = self.drive.verify_upload_metadata(file_uuid, args.local)
-            
-            return 0 if match else 1
-        
-        except Exception as e:
-            print(f"❌ Verification failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+        # Check if UUID or path
+        input_str = args.remote
+
+        if _is_uuid(input_str):
+            file_uuid = input_str
+            print("🔍 Verifying upload by UUID")
+            print(f"   Remote UUID: {file_uuid}")
+            print(f"   Local file: {args.local}")
+            print()
+        else:
+            print(f"🔍 Resolving remote path: {input_str}")
+            resolved = self.drive.resolve_path(input_str)
 
+            if resolved['type'] != 'file':
+                print(f"❌ Error: \"{input_str}\" is not a file")
+                return 1
+
+            file_uuid = resolved['uuid']
+            print(f"   ✅ Resolved to UUID: {file_uuid}")
+            print(f"   Local file: {args.local}")
+            print()
+
+        match = self.drive.verify_upload_metadata(file_uuid, args.local)
+
+        return 0 if match else 1
+
+    @_requires_client()
+    @_handles_errors('List trash')
     def handle_list_trash(self, args) -> int:
         """Handle list-trash command with filtering"""
-        try:
-            self._prepare_client()
-            
-            print("🗑️ Listing trash contents...\n")
-            items = self.drive.get_trash_content()
-            
-            # Apply Filters
-            include = getattr(args, 'include', []) or []
-            exclude = getattr(args, 'exclude', []) or []
-            filtered = [i for i in items if self._should_process_item(i['name'], include, exclude)]
-            
-            if not filtered:
-                print("📭 Trash is empty (or all items filtered)")
-                return 0
-            
-            self._print_item_list(filtered, detailed=True, show_uuids=args.uuids)
+        print("🗑️ Listing trash contents...\n")
+        items, _, _ = self._get_trash_index()
+
+        # Apply Filters
+        include = getattr(args, 'include', []) or []
+        exclude = getattr(args, 'exclude', []) or []
+        filtered = [i for i in items if self._should_process_item(i['name'], include, exclude)]
+
+        if not filtered:
+            print("📭 Trash is empty (or all items filtered)")
             return 0
-            
-        except Exception as e:
-            print(f"❌ List trash failed: {e}")
-            return 1
 
+        self._print_item_list(filtered, detailed=True, show_uuids=args.uuids)
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Tree')
     def handle_tree(self, args) -> int:
         """Handle tree command"""
-        try:
-            self._prepare_client()
-            
-            print(f"\n🌳 Folder tree: {args.path}")
-            print("=" * 60)
-            print(args.path if args.path == '/' else f"📁 {os.path.basename(args.path)}")
-            
-            self.drive.print_tree(
-                args.path,
-                lambda line: print(line),
-                max_depth=args.depth
-            )
-            
-            print(f"\n(Showing max {args.depth} levels deep)")
-            
-            return 0
-        
-        except Exception as e:
-            print(f"❌ Tree failed: {e}")
-            if self.debug:
-                import traceback
-                traceback.print_exc()
-            return 1
+        print(f"\n🌳 Folder tree: {args.path}")
+        print("=" * 60)
+        print(args.path if args.path == '/' else f"📁 {args.path.rstrip('/').rpartition('/')[2]}")
+
+        # Buffer ~4KiB of tree lines per write instead of one
+        # syscall per row
+        buf = []
+        buf_len = 0
+
+        def emit(line):
+            nonlocal buf_len
+            buf.append(line)
+            buf_len += len(line) + 1
+            if buf_len > 4096:
+                sys.stdout.write("\n".join(buf) + "\n")
+                buf.clear()
+                buf_len = 0
+
+        self.drive.print_tree(args.path, emit, max_depth=args.depth)
+        if buf:
+            sys.stdout.write("\n".join(buf) + "\n")
+
+        print(f"\n(Showing max {args.depth} levels deep)")
+
+        return 0
 
     # ============================================================================
     # WEBDAV HANDLERS
     # ============================================================================
 
+    @_requires_client()
     def handle_mount(self, args) -> int:
         """Handle mount command (foreground WebDAV server)"""
         try:
-            self._prepare_client()
-            print(f"🏔️ Mounting Filen Drive via WebDAV on port {args.port}...")
+            port = self._get_port(args)
+            print(f"🏔️ Mounting Filen Drive via WebDAV on port {port}...")
             print("   Press Ctrl+C to stop")
             
             # This will block until stopped
-            result = webdav_server.start(port=args.port, background=False)
+            from services.webdav_server import webdav_server
+            result = webdav_server.start(port=port, background=False)
             
             if not result['success']:
                 print(f"❌ Failed to start server: {result.get('message')}")
@@ -1311,11 +1642,43 @@ WebDAV Examples:
             print(f"❌ Error: {e}")
             return 1
 
+    @staticmethod
+    def _spawn_daemon(argv: list) -> int:
+        """Spawn a detached child with stdout/stderr silenced; returns its PID.
+
+        os.posix_spawn takes the kernel's fast spawn path and avoids
+        forking the parent's full address space; subprocess.Popen stays
+        as the fallback for Windows and platforms without setsid support.
+        """
+        if hasattr(os, 'posix_spawn'):
+            devnull = os.open(os.devnull, os.O_RDWR)
+            try:
+                return os.posix_spawn(
+                    argv[0], argv, os.environ,
+                    file_actions=[
+                        (os.POSIX_SPAWN_DUP2, devnull, 1),
+                        (os.POSIX_SPAWN_DUP2, devnull, 2),
+                    ],
+                    setsid=True,
+                )
+            except NotImplementedError:
+                pass
+            finally:
+                os.close(devnull)
+
+        import subprocess
+        return subprocess.Popen(
+            argv,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        ).pid
+
     def handle_webdav_start(self, args) -> int:
         """Handle webdav-start command"""
         is_daemon = args.daemon
         background = args.background
-        port = args.port
+        port = self._get_port(args)
         
         # --- DAEMON PROCESS (Child) ---
         if is_daemon:
@@ -1325,6 +1688,7 @@ WebDAV Examples:
                 
                 # 2. Start the server (blocks here)
                 # We use background=True mode in webdav_server which uses quiet logging
+                from services.webdav_server import webdav_server
                 webdav_server.start(port=port, background=True)
                 return 0
             except Exception:
@@ -1348,30 +1712,21 @@ WebDAV Examples:
             print("🚀 Starting WebDAV server in background...")
             
             try:
-                # Start daemon process
-                import subprocess
-                
-                # Launch self with --daemon flag
-                process = subprocess.Popen(
-                    [sys.executable, __file__, 'webdav-start', '--daemon', f'--port={port}'],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    start_new_session=True
+                # Launch self with --daemon flag as a detached process
+                pid = self._spawn_daemon(
+                    [sys.executable, __file__, 'webdav-start', '--daemon', f'--port={port}']
                 )
-                
-                # Give it time to start
-                import time
-                time.sleep(1)
-                
-                # Verify running
-                if not self.network.is_process_running(process.pid):
+
+                # Wait until the listener is up (or the child died)
+                # instead of sleeping a blind second
+                if not self.network.wait_for_port(port, pid=pid):
                     print("❌ Failed to start background process")
                     self.config.clear_webdav_pid()
                     return 1
-                
-                self.config.save_webdav_pid(process.pid)
-                
-                print(f"✅ WebDAV server started in background (PID: {process.pid})")
+
+                self.config.save_webdav_pid(pid)
+
+                print(f"✅ WebDAV server started in background (PID: {pid})")
                 print(f"   URL: http://localhost:{port}/")
                 print("   User: filen")
                 print("   Pass: filen-webdav")
@@ -1422,7 +1777,7 @@ WebDAV Examples:
     def handle_webdav_status(self, args) -> int:
         """Handle webdav-status command"""
         pid = self.config.read_webdav_pid()
-        port = args.port
+        port = self._get_port(args)
         
         if not pid:
             print("❌ WebDAV server is not running (no PID file).")
@@ -1448,7 +1803,7 @@ WebDAV Examples:
 
     def handle_webdav_test(self, args) -> int:
         """Handle webdav-test command"""
-        port = args.port
+        port = self._get_port(args)
         url = f"http://localhost:{port}/"
         
         print(f"🧪 Testing WebDAV server connection at {url} ...")
@@ -1465,7 +1820,7 @@ WebDAV Examples:
 
     def handle_webdav_mount(self, args) -> int:
         """Handle webdav-mount command"""
-        port = args.port
+        port = self._get_port(args)
         url = f"http://localhost:{port}/"
         
         print("🗂️  Mount Instructions for Filen Drive")
@@ -1497,7 +1852,7 @@ WebDAV Examples:
 
     def handle_webdav_config(self, args) -> int:
         """Handle webdav-config command"""
-        port = args.port
+        port = self._get_port(args)
         
         print("⚙️  WebDAV Server Configuration")
         print("=" * 40)
@@ -1526,82 +1881,115 @@ WebDAV Examples:
         
         # Show session info if logged in
         try:
-            creds = self.auth.get_credentials()
+            creds = self._get_cached_credentials()
             print("")
             print("👤 Current Session:")
             print(f"   User: {creds.get('email', 'N/A')}")
             
             last_login = creds.get('lastLoggedInAt', '')
             if last_login:
-                from datetime import datetime
-                dt = datetime.fromisoformat(last_login.replace('Z', '+00:00'))
-                print(f"   Last Login: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        except:
+                print(f"   Last Login: {_format_last_login(last_login)}")
+        except (ValueError, KeyError, AttributeError):
             print("")
             print("👤 Current Session: Not logged in")
         
         return 0
 
+    def handle_batch(self, args) -> int:
+        """Handle batch command - run commands from a file in one session"""
+        import shlex
+
+        try:
+            if args.file == '-':
+                source = sys.stdin.read().splitlines()
+            else:
+                with open(args.file, 'r') as f:
+                    source = f.read().splitlines()
+        except OSError as e:
+            print(f"❌ Cannot read batch file: {e}")
+            return 1
+
+        # run() rebinds self.force per line, so remember the batch-level flag
+        continue_on_error = self.force
+        failures = 0
+        for lineno, line in enumerate(source, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            tokens = shlex.split(line)
+            if tokens and tokens[0] == 'batch':
+                print(f"⚠️  Line {lineno}: nested batch not allowed, skipping")
+                failures += 1
+                continue
+
+            print(f"▶️  {line}")
+            # Reuse this instance: credentials, parsers and the
+            # resolve/trash caches all carry over between lines
+            if self.run(tokens) != 0:
+                failures += 1
+                if not continue_on_error:
+                    print(f"❌ Batch aborted at line {lineno} (use -f to continue on errors)")
+                    return 1
+
+        if failures:
+            print(f"\n⚠️  Batch finished with {failures} failed command(s)")
+            return 1
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Restore')
     def handle_restore_uuid(self, args) -> int:
         """Restore item from trash by UUID"""
-        try:
-            self._prepare_client()
-            
-            # We need to know if it's a file or folder to call the right API
-            print("🔍 Searching trash...")
-            trash = self.drive.get_trash_content()
-            
-            item = next((i for i in trash if i['uuid'] == args.uuid), None)
-            
-            if not item:
-                print(f"❌ Item {args.uuid} not found in trash")
-                return 1
-                
-            print(f"♻️  Restoring {item['type']} \"{item['name']}\"...")
-            self.drive.restore_item(item['uuid'], item['type'])
-            print("✅ Restore successful")
-            return 0
-            
-        except Exception as e:
-            print(f"❌ Restore failed: {e}")
+        # We need to know if it's a file or folder to call the right API
+        print("🔍 Searching trash...")
+        _, by_uuid, _ = self._get_trash_index()
+
+        item = by_uuid.get(args.uuid)
+
+        if not item:
+            print(f"❌ Item {args.uuid} not found in trash")
             return 1
 
+        print(f"♻️  Restoring {item['type']} \"{item['name']}\"...")
+        self.drive.restore_item(item['uuid'], item['type'])
+        self._trash_index = None
+        print("✅ Restore successful")
+        return 0
+
+    @_requires_client()
+    @_handles_errors('Restore')
     def handle_restore_path(self, args) -> int:
         """Restore item from trash by Name"""
-        try:
-            self._prepare_client()
-            
-            print("🔍 Searching trash...")
-            trash = self.drive.get_trash_content()
-            
-            # Find items matching the name
-            matches = [i for i in trash if i['name'] == args.name]
-            
-            if not matches:
-                print(f"❌ No item named \"{args.name}\" found in trash")
-                return 1
-            
-            if len(matches) > 1:
-                print(f"⚠️  Multiple items found named \"{args.name}\":")
-                for i in matches:
-                    print(f"   - {i['type'].ljust(6)} {i['uuid']} (Size: {format_size(i.get('size', 0))})")
-                print("💡 Use 'restore-uuid' with the specific UUID")
-                return 1
-            
-            item = matches[0]
-            print(f"♻️  Restoring {item['type']} \"{item['name']}\"...")
-            self.drive.restore_item(item['uuid'], item['type'])
-            print("✅ Restore successful")
-            return 0
-            
-        except Exception as e:
-            print(f"❌ Restore failed: {e}")
+        print("🔍 Searching trash...")
+        _, _, by_name = self._get_trash_index()
+
+        # Find items matching the name (indexed, no linear scan)
+        matches = by_name.get(args.name, [])
+
+        if not matches:
+            print(f"❌ No item named \"{args.name}\" found in trash")
+            return 1
+
+        if len(matches) > 1:
+            from services.drive import format_size
+            print(f"⚠️  Multiple items found named \"{args.name}\":")
+            for i in matches:
+                print(f"   - {i['type'].ljust(6)} {i['uuid']} (Size: {format_size(i.get('size', 0))})")
+            print("💡 Use 'restore-uuid' with the specific UUID")
             return 1
 
+        item = matches[0]
+        print(f"♻️  Restoring {item['type']} \"{item['name']}\"...")
+        self.drive.restore_item(item['uuid'], item['type'])
+        self._trash_index = None
+        print("✅ Restore successful")
+        return 0
+
+    @_requires_client()
     def handle_resolve(self, args) -> int:
         """Debug command to resolve a path"""
         try:
-            self._prepare_client()
             print(f"🔍 Resolving: {args.path}")
             
             result = self.drive.resolve_path(args.path)
@@ -33,7 +33,11 @@ class ConfigService:
         # WebDAV defaults
         self.webdav_default_port = 8080
         self.webdav_default_protocol = 'http'
-        
+
+        # Last written batch-state digest per batch id, to skip
+        # persisting states that didn't actually change
+        self._batch_state_hashes: Dict[str, bytes] = {}
+
         self._ensure_directories()
 
     def _ensure_directories(self) -> None:
@@ -65,9 +69,18 @@ class ConfigService:
 
     def save_batch_state(self, batch_id: str, state: Dict[str, Any]) -> None:
         """Save batch operation state"""
+        # Compact separators: this is rewritten on every task state
+        # change during large batches, and nobody reads it by hand
+        payload = json.dumps(state, separators=(',', ':')).encode()
+
+        digest = hashlib.blake2b(payload, digest_size=8).digest()
+        if self._batch_state_hashes.get(batch_id) == digest:
+            return  # unchanged since last write
+
         batch_file = self.batch_state_dir / f'batch_state_{batch_id}.json'
-        with open(batch_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        with open(batch_file, 'wb') as f:
+            f.write(payload)
+        self._batch_state_hashes[batch_id] = digest
 
     def load_batch_state(self, batch_id: str) -> Optional[Dict[str, Any]]:
         """Load batch operation state"""
@@ -82,6 +95,7 @@ class ConfigService:
 
     def delete_batch_state(self, batch_id: str) -> None:
         """Delete batch operation state"""
+        self._batch_state_hashes.pop(batch_id, None)
         batch_file = self.batch_state_dir / f'batch_state_{batch_id}.json'
         if batch_file.exists():
             batch_file.unlink()
@@ -5,8 +5,10 @@ File operations for Filen with batching, resume, search, etc.
 """
 
 import os
+import re
 import json
 import hashlib
+import functools
 import glob as glob_module
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Callable, Tuple, Iterator
@@ -24,6 +26,14 @@ from services.api import api_client
 from services.crypto import crypto_service
 
 
+@functools.lru_cache(maxsize=64)
+def _pattern_union_matcher(patterns: Tuple[str, ...]) -> Callable:
+    """Compile a tuple of glob patterns into one union regex matcher"""
+    import fnmatch
+    combined = '|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns)
+    return re.compile(combined).match
+
+
 class ChunkUploadException(Exception):
     """Exception for chunk upload failures with resume info"""
     def __init__(self, message: str, file_uuid: str, upload_key: str, 
@@ -52,7 +62,9 @@ class DriveService:
         self._folder_cache = {}
         self._file_cache = {}
         self._path_cache = {}  # Caches path strings to UUIDs
+        self._resolve_cache = {}  # Normalized path -> resolved node
         self._cache_duration = 600  # 10 minutes
+        self._neg_cache_duration = 30  # Short TTL for cached path misses
 
     def set_credentials(self, credentials: Dict[str, Any]) -> None:
         """Set credentials from login"""
@@ -80,9 +92,11 @@ class DriveService:
         self._folder_cache.pop(folder_uuid, None)
         self._file_cache.pop(folder_uuid, None)
         
-        # Clear path cache on modification to be safe
-        self._path_cache = {} 
-        
+        # Clear path caches on modification to be safe
+        self._path_cache = {}
+        self._resolve_cache = {}
+
+
         self._log(f"Cache invalidated for folder: {folder_uuid}")
 
     def _try_decrypt(self, encrypted: str) -> str:
@@ -291,8 +305,45 @@ class DriveService:
 
     def resolve_path(self, path: str) -> Dict[str, Any]:
         """
-        Resolve a path to a folder or file
+        Resolve a path to a folder or file (memoized per normalized path)
         """
+        key = path.strip().strip('/')
+
+        # Check cache ('data' of None records a recent miss, so scripted
+        # retries against a not-yet-existing path skip the tree walk too)
+        cache_entry = self._resolve_cache.get(key)
+        if cache_entry is not None:
+            age = (datetime.now() - cache_entry['timestamp']).seconds
+            if cache_entry['data'] is None:
+                if age < self._neg_cache_duration:
+                    self._log(f"Using cached miss for /{key}")
+                    raise FileNotFoundError(f"Path not found: {path}")
+            elif age < self._cache_duration:
+                self._log(f"Using cached resolve for /{key}")
+                return cache_entry['data']
+
+        try:
+            result = self._resolve_path_uncached(path)
+        except FileNotFoundError:
+            if len(self._resolve_cache) > 1024:
+                self._resolve_cache.clear()
+            self._resolve_cache[key] = {
+                'data': None,
+                'timestamp': datetime.now()
+            }
+            raise
+
+        # Update cache (bounded; wiped on any modification anyway)
+        if len(self._resolve_cache) > 1024:
+            self._resolve_cache.clear()
+        self._resolve_cache[key] = {
+            'data': result,
+            'timestamp': datetime.now()
+        }
+        return result
+
+    def _resolve_path_uncached(self, path: str) -> Dict[str, Any]:
+        """Walk the folder tree to resolve a path"""
         if not self.base_folder_uuid:
             raise ValueError("Not logged in")
         
@@ -371,21 +422,22 @@ class DriveService:
     # FOLDER OPERATIONS
     # ============================================================================
 
-    def create_folder(self, name: str, parent_uuid: str) -> None:
-        """Create a single folder"""
+    def create_folder(self, name: str, parent_uuid: str) -> str:
+        """Create a single folder; returns the new folder's UUID"""
         uuid = self.crypto.generate_uuid()
         master_key = self._get_master_key()
-        
+
         # Encrypt name
         name_json = json.dumps({'name': name})
         name_encrypted = self.crypto.encrypt_metadata_002(name_json, master_key)
-        
+
         # Hash name
         name_hashed = self.crypto.hash_filename(name, self.email, master_key)
-        
+
         # Create folder
         self.api.create_folder(uuid, name_encrypted, name_hashed, parent_uuid)
         self._invalidate_cache(parent_uuid)
+        return uuid
 
     def create_folder_recursive(self, path: str) -> Dict[str, Any]:
         """
@@ -447,39 +499,39 @@ class DriveService:
                 # Cache this level
                 self._path_cache[clean_part_path] = current_info
             else:
-                # Create folder
+                # Create folder; the returned UUID lets us descend
+                # immediately without sleeping and re-listing the parent
                 self._log(f"Creating folder: {part} in {current_path}")
-                
+
                 try:
-                    self.create_folder(part, current_uuid)
+                    new_uuid = self.create_folder(part, current_uuid)
+                    current_info = {'uuid': new_uuid, 'name': part, 'path': clean_part_path}
                 except Exception as e:
-                    # Handle 409 conflict
+                    # Handle 409 conflict: created concurrently, re-list
+                    # to pick up the existing folder's UUID
                     if '409' in str(e) or 'already exists' in str(e).lower():
                         import time
                         time.sleep(1)
                         self._invalidate_cache(current_uuid)
+                        folders = self.list_folders(current_uuid, use_cache=False)
+
+                        existing = None
+                        for folder in folders:
+                            if folder['name'] == part:
+                                existing = folder
+                                break
+
+                        if not existing:
+                            raise Exception(f"Folder conflict but couldn't find it: {part}")
+
+                        current_info = existing
+                        current_info['path'] = clean_part_path
                     else:
                         raise
-                
-                import time
-                time.sleep(0.5)
-                self._invalidate_cache(current_uuid)
-                folders = self.list_folders(current_uuid, use_cache=False)
-                
-                new_folder = None
-                for folder in folders:
-                    if folder['name'] == part:
-                        new_folder = folder
-                        break
-                
-                if not new_folder:
-                    raise Exception(f"Created folder but couldn't find it: {part}")
-                
-                current_uuid = new_folder['uuid']
-                current_info = new_folder
-                current_info['path'] = clean_part_path
+
+                current_uuid = current_info['uuid']
                 current_path = part_path_str
-                
+
                 # Cache new folder
                 self._path_cache[clean_part_path] = current_info
         
@@ -682,20 +734,21 @@ class DriveService:
 
     def should_include_file(self, filename: str, include: List[str], exclude: List[str]) -> bool:
         """Check if file should be included based on patterns"""
-        import fnmatch
-        
-        # Check include patterns
+        if not include and not exclude:
+            return True
+
+        # One cached union regex per pattern set instead of
+        # fnmatch.fnmatch per file per pattern
+        name = os.path.normcase(filename)
+
         if include:
-            matches_include = any(fnmatch.fnmatch(filename, pattern) for pattern in include)
-            if not matches_include:
+            if _pattern_union_matcher(tuple(include))(name) is None:
                 return False
-        
-        # Check exclude patterns
+
         if exclude:
-            matches_exclude = any(fnmatch.fnmatch(filename, pattern) for pattern in exclude)
-            if matches_exclude:
+            if _pattern_union_matcher(tuple(exclude))(name) is not None:
                 return False
-        
+
         return True
 
     def upload(
@@ -1069,17 +1122,22 @@ class DriveService:
             else:
                 local_path = filename
             
-            # Check conflict
-            if os.path.exists(local_path):
+            # Check conflict (single stat for existence + mtime)
+            try:
+                local_stat = os.stat(local_path)
+            except OSError:
+                local_stat = None
+
+            if local_stat is not None:
                 if on_conflict == 'skip':
                     print(f"⏭️  Skipping: {local_path} (exists)")
                     return
                 elif on_conflict == 'newer':
                     metadata = item_info['metadata']
                     remote_mod_time = metadata.get('lastModified', metadata.get('timestamp', 0))
-                    
+
                     if remote_mod_time:
-                        local_mod_time = int(os.path.getmtime(local_path) * 1000)
+                        local_mod_time = int(local_stat.st_mtime * 1000)
                         if remote_mod_time <= local_mod_time:
                             print(f"⏭️  Skipping: {local_path} (local is newer)")
                             return
@@ -1288,8 +1346,14 @@ class DriveService:
                         pbar.update(1)
                         continue
                     
-                    # Check Conflict
-                    if os.path.exists(local_path):
+                    # Check Conflict (one stat per task covers both the
+                    # existence test and the mtime comparison)
+                    try:
+                        local_stat = os.stat(local_path)
+                    except OSError:
+                        local_stat = None
+
+                    if local_stat is not None:
                         if on_conflict == 'skip':
                             if self.debug: print(f"⏭️  Skipping: {filename} (exists)")
                             skipped_count += 1
@@ -1299,7 +1363,7 @@ class DriveService:
                             continue
                         elif on_conflict == 'newer':
                             if remote_mod_time:
-                                local_mod_time = int(os.path.getmtime(local_path) * 1000)
+                                local_mod_time = int(local_stat.st_mtime * 1000)
                                 if remote_mod_time <= local_mod_time:
                                     if self.debug: print(f"⏭️  Skipping: {filename} (local is newer)")
                                     skipped_count += 1
@@ -1595,23 +1659,28 @@ class DriveService:
         """
         Find files matching pattern (Optimized using Tree endpoint)
         """
+        return list(self.iter_find_files(start_path, pattern, max_depth=max_depth))
+
+    def iter_find_files(self, start_path: str, pattern: str, max_depth: int = -1) -> Iterator[Dict[str, Any]]:
+        """
+        Yield files matching pattern as they are matched, so callers can
+        stream results instead of waiting for the full list
+        """
         import fnmatch
-        
+
         # 1. Resolve start node
         try:
             start_node = self.resolve_path(start_path)
             if start_node['type'] != 'folder':
-                return []
+                return
             start_uuid = start_node['uuid']
         except Exception as e:
             self._log(f"Find failed to resolve path: {e}")
-            return []
+            return
 
         # 2. Fetch entire tree structure once
         folder_map, file_list, _ = self._fetch_and_parse_tree(start_uuid)
-        
-        results = []
-        
+
         # Helper to construct full path
         def build_path(parent_uuid):
             path_parts = []
@@ -1651,11 +1720,9 @@ class DriveService:
                 
                 if max_depth != -1 and rel_depth > max_depth:
                     continue
-                
+
                 file['fullPath'] = full_path
-                results.append(file)
-                
-        return results
+                yield file
 
     # ============================================================================
     # TREE DISPLAY (OPTIMIZED)
@@ -1717,15 +1784,20 @@ class DriveService:
         Verify uploaded file using metadata hash (no download needed)
         """
         self._log("Verifying upload using metadata check...")
-        
-        # Hash local file
+
+        # Local hashing is CPU/disk bound and the metadata fetch is
+        # network bound - run them concurrently
+        from concurrent.futures import ThreadPoolExecutor
+
         print("   📊 Hashing local file...")
-        local_hash = self.crypto.hash_file_sha512(local_file)
-        self._log(f"   Local SHA-512: {local_hash}")
-        
-        # Get file metadata
         print("   📋 Fetching metadata from server...")
-        file_meta = self.api.get_file_metadata(file_uuid)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            hash_future = pool.submit(self.crypto.hash_file_sha512, local_file)
+            meta_future = pool.submit(self.api.get_file_metadata, file_uuid)
+            local_hash = hash_future.result()
+            file_meta = meta_future.result()
+
+        self._log(f"   Local SHA-512: {local_hash}")
         
         encrypted = file_meta.get('metadata')
         decrypted = self._try_decrypt(encrypted)
@@ -1755,8 +1827,10 @@ class DriveService:
 drive_service = DriveService()
 
 
+@functools.lru_cache(maxsize=4096)
 def format_size(size: int) -> str:
-    """Format bytes to human-readable size"""
+    """Format bytes to human-readable size (memoized - sizes repeat a lot
+    in large listings, folders are always 0)"""
     if size <= 0:
         return '0 B'
     
@@ -1771,14 +1845,16 @@ def format_size(size: int) -> str:
     return f"{size_float:.1f} {units[i]}"
 
 
+@functools.lru_cache(maxsize=4096)
 def format_date(timestamp: int) -> str:
-    """Format timestamp to date string"""
+    """Format timestamp to date string (memoized - repeated timestamps
+    skip the datetime round trip)"""
     if not timestamp:
         return ''
     
     try:
         dt = datetime.fromtimestamp(timestamp / 1000.0)
         return dt.strftime('%Y-%m-%d')
-    except:
+    except (ValueError, OSError, OverflowError, TypeError):
         return ''
 
@@ -24,10 +24,28 @@ from config.config import config_service
 
 class NetworkUtils:
     """Network utilities for WebDAV SSL certificates and process management"""
-    
+
+    # Short-lived liveness results: pid -> (alive, monotonic timestamp).
+    # webdav handlers probe the same PID several times in a row; the TTL
+    # collapses those into one subprocess call.
+    _liveness_cache: Dict[int, tuple] = {}
+    _LIVENESS_TTL = 0.1
+
     @classmethod
     def is_process_running(cls, pid: int) -> bool:
-        """Check if process is running"""
+        """Check if process is running (cached for a tenth of a second)"""
+        import time
+        cached = cls._liveness_cache.get(pid)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < cls._LIVENESS_TTL:
+            return cached[0]
+        alive = cls._check_process_running(pid)
+        cls._liveness_cache[pid] = (alive, now)
+        return alive
+
+    @classmethod
+    def _check_process_running(cls, pid: int) -> bool:
+        """Uncached process liveness probe"""
         try:
             if platform.system() == 'Windows':
                 # Windows: use tasklist
@@ -47,11 +65,30 @@ class NetworkUtils:
         except Exception:
             return False
     
+    @classmethod
+    def wait_for_port(cls, port: int, pid: Optional[int] = None, timeout: float = 5.0) -> bool:
+        """
+        Poll until something is listening on localhost:port, up to timeout
+        If pid is given, gives up early once that process has died
+        """
+        import time
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.25)
+                if sock.connect_ex(('127.0.0.1', port)) == 0:
+                    return True
+            if pid is not None and not cls.is_process_running(pid):
+                return False
+            time.sleep(0.05)
+        return False
+
     @classmethod
     def kill_process(cls, pid: int, force: bool = False) -> bool:
         """
         Kill process by PID
         """
+        cls._liveness_cache.pop(pid, None)
         try:
             if platform.system() == 'Windows':
                 cmd = ['taskkill', '/PID', str(pid)]